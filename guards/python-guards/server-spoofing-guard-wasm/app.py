@@ -12,6 +12,7 @@ Protects against:
 
 import json
 import hashlib
+import re
 from typing import Optional
 
 # Import the generated bindings (created by componentize-py from WIT)
@@ -29,37 +30,116 @@ from wit_world.imports import host
 
 # Global state (persists within WASM instance)
 _tool_registry: dict[str, dict[str, str]] = {}  # server -> {tool_name: fingerprint}
+_registry_tool_owners: dict[str, str] = {}  # tool_name -> owning server
 _config_cache: Optional[dict] = None
+_config_version: Optional[str] = None  # host-published tag for cache invalidation
+_whitelist_norm: Optional[list[tuple[str, int, dict]]] = None  # (name_lower, len, entry)
+_trusted_fp_index: Optional[dict[str, tuple[str, str]]] = None  # fingerprint -> (server, tool)
+_trusted_name_index: Optional[dict[str, list[tuple[str, str]]]] = None  # tool_lower -> [(server, tool)]
+_url_patterns: Optional[list[tuple["re.Pattern[str]", dict]]] = None  # compiled url_pattern per entry
+_settings_schema_json: Optional[str] = None  # serialized lazily, reused across calls
+_default_config_json: Optional[str] = None
+
+# Optional fast path: when running as native Python (not componentized to
+# WASM), rapidfuzz provides a SIMD/bit-parallel C implementation of
+# Levenshtein. The WASM build has no external deps and uses the pure-Python
+# fallback below. A Numba-jitted kernel was evaluated for the native case
+# and rejected: the Myers kernel relies on arbitrary-precision ints and a
+# str-keyed dict (unsupported in nopython mode), and for single-word server
+# names the jit dispatch overhead exceeds the comparison itself.
+try:
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+except ImportError:
+    _rf_levenshtein = None
+
+# Scratch map for the pure-Python Levenshtein kernel, reused across calls
+_peq_scratch: dict[str, int] = {}
 
 
 def levenshtein_ratio(s1: str, s2: str) -> float:
-    """Calculate Levenshtein similarity ratio between two strings."""
+    """Calculate Levenshtein similarity ratio between two strings.
+
+    Uses Myers' bit-parallel algorithm: the shorter string is packed into
+    per-character bitmasks, and each character of the longer string is
+    processed with a constant number of word operations on the VP/VN delta
+    vectors. Server names fit in a single machine word, so the classic
+    O(m*n) inner loop collapses to O(m) bitwise steps with no per-row
+    allocations. Pure stdlib, so it stays WASM-friendly.
+    """
     if not s1 or not s2:
         return 0.0
     if s1 == s2:
         return 1.0
+    if _rf_levenshtein is not None:
+        return _rf_levenshtein.normalized_similarity(s1, s2)
     len1, len2 = len(s1), len(s2)
     if len1 < len2:
         s1, s2 = s2, s1
         len1, len2 = len2, len1
-    distances = list(range(len2 + 1))
-    for i1, c1 in enumerate(s1):
-        new_distances = [i1 + 1]
-        for i2, c2 in enumerate(s2):
-            if c1 == c2:
-                new_distances.append(distances[i2])
-            else:
-                new_distances.append(1 + min((distances[i2], distances[i2 + 1], new_distances[-1])))
-        distances = new_distances
-    distance = distances[-1]
-    return 1.0 - (distance / max(len1, len2))
+
+    # Bitmask of positions for each character of the shorter string.
+    # The map is a module-level scratch reused across calls (the guard is
+    # single-threaded inside the WASM instance), so the hot typosquat loop
+    # does not allocate a fresh dict per whitelist entry.
+    peq = _peq_scratch
+    peq.clear()
+    for i, c in enumerate(s2):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << len2) - 1
+    msb = 1 << (len2 - 1)
+    vp = mask  # vertical positive deltas
+    vn = 0     # vertical negative deltas
+    score = len2
+    peq_get = peq.get
+
+    for c in s1:
+        x = peq_get(c, 0) | vn
+        d0 = (((x & vp) + vp) ^ vp) | x
+        hn = vp & d0
+        hp = vn | (~(vp | d0) & mask)
+        if hp & msb:
+            score += 1
+        elif hn & msb:
+            score -= 1
+        x = ((hp << 1) | 1) & mask
+        vn = x & d0
+        vp = ((hn << 1) & mask) | (~(x | d0) & mask)
+
+    return 1.0 - (score / len1)
+
+
+def _dumps_details(details: dict) -> str:
+    """Serialize deny details compactly (no whitespace separators).
+
+    orjson would be faster still, but is a native extension and cannot be
+    componentized; compact separators keep the stdlib encoder and shave
+    the output size.
+    """
+    return json.dumps(details, separators=(",", ":"))
 
 
 def _get_config() -> dict:
-    """Load configuration from host."""
-    global _config_cache
-    if _config_cache is not None:
+    """Load configuration from host.
+
+    The parsed config is cached and tagged with the host's
+    "guard_config_version" value: a cheap string compare decides whether
+    the JSON needs to be re-fetched and re-deserialized. Hosts that do not
+    publish a version return "" and the first parse is cached for the
+    lifetime of the instance, as before.
+    """
+    global _config_cache, _config_version, _whitelist_norm
+    version = host.get_config("guard_config_version")
+    if _config_cache is not None and version == _config_version:
         return _config_cache
+    _config_version = version
+
+    # Drop caches derived from the previous config
+    _whitelist_norm = None
+    global _trusted_fp_index, _trusted_name_index, _url_patterns
+    _trusted_fp_index = None
+    _trusted_name_index = None
+    _url_patterns = None
 
     config_json = host.get_config("guard_config")
     if config_json:
@@ -80,40 +160,101 @@ def _get_whitelist() -> list[dict]:
     return config.get("whitelist", [])
 
 
+def _get_whitelist_norm() -> list[tuple[str, int, dict]]:
+    """Get whitelist as (lowercased name, name length, entry) tuples.
+
+    Lowercasing and length metadata are computed once per config load
+    instead of on every evaluation, since the whitelist is scanned per
+    connection attempt.
+    """
+    global _whitelist_norm
+    if _whitelist_norm is None:
+        _whitelist_norm = []
+        for entry in _get_whitelist():
+            name = entry.get("name", "").lower()
+            _whitelist_norm.append((name, len(name), entry))
+    return _whitelist_norm
+
+
+def _get_url_patterns() -> list[tuple["re.Pattern[str]", dict]]:
+    """Get whitelist entries' url_pattern regexes, compiled once per config load.
+
+    Entries without a pattern are omitted; invalid patterns are logged and
+    skipped rather than re-raising on every evaluation.
+    """
+    global _url_patterns
+    if _url_patterns is None:
+        _url_patterns = []
+        for entry in _get_whitelist():
+            pattern = entry.get("url_pattern")
+            if not pattern:
+                continue
+            try:
+                _url_patterns.append((re.compile(pattern, re.IGNORECASE), entry))
+            except re.error:
+                host.log(3, f"Invalid url_pattern in whitelist entry '{entry.get('name')}': {pattern}")
+    return _url_patterns
+
+
+def _matches_url_pattern(server_url: str) -> Optional[dict]:
+    """Find a whitelist entry whose url_pattern matches the server URL."""
+    for compiled, entry in _get_url_patterns():
+        if compiled.match(server_url):
+            return entry
+    return None
+
+
 def _get_threshold() -> float:
     """Get typosquat similarity threshold."""
     config = _get_config()
     return config.get("typosquat_similarity_threshold", 0.85)
 
 
-def _is_whitelisted(server_name: str) -> bool:
-    """Check if server is in whitelist."""
-    whitelist = _get_whitelist()
-    server_lower = server_name.lower()
-
-    for entry in whitelist:
-        if entry.get("name", "").lower() == server_lower:
+def _is_whitelisted(server_lower: str) -> bool:
+    """Check if server is in whitelist. Expects an already-lowercased name."""
+    for name_lower, _, _ in _get_whitelist_norm():
+        if name_lower == server_lower:
             return True
 
     return False
 
 
-def _detect_typosquat(server_name: str) -> Optional[str]:
+def _detect_typosquat(test_name: str) -> Optional[str]:
     """
     Detect if server name is a typosquat of an approved server.
-    Returns the name of the similar approved server if detected.
+    Expects an already-lowercased name; returns the name of the similar
+    approved server if detected.
     """
     threshold = _get_threshold()
-    whitelist = _get_whitelist()
-    test_name = server_name.lower()
-
-    for entry in whitelist:
-        approved_name = entry.get("name", "").lower()
+    test_len = len(test_name)
 
+    for approved_name, approved_len, entry in _get_whitelist_norm():
         # Skip exact matches
         if approved_name == test_name:
             continue
 
+        # Length filter: edit distance is at least the length difference,
+        # so similarity can never reach the threshold when lengths differ
+        # too much. Skips the Levenshtein call for most whitelist entries.
+        max_len = max(approved_len, test_len)
+        if max_len == 0 or 1.0 - (abs(approved_len - test_len) / max_len) < threshold:
+            continue
+
+        # Zero-tolerance short names: when even one edit already drops
+        # the similarity below the threshold, only an exact match could
+        # pass -- and exact matches were skipped above. Typical with the
+        # default 0.85 threshold for names shorter than 7 characters.
+        if 1.0 - (1.0 / max_len) < threshold:
+            continue
+
+        # Equal-length names: a single scan settles the common case. One
+        # substituted character is exactly the single-char typosquat
+        # pattern with edit distance 1, so no Levenshtein run is needed.
+        if approved_len == test_len:
+            diffs = sum(1 for a, b in zip(approved_name, test_name) if a != b)
+            if diffs == 1:
+                return entry.get("name")
+
         # Calculate similarity
         similarity = levenshtein_ratio(approved_name, test_name)
 
@@ -125,6 +266,19 @@ def _detect_typosquat(server_name: str) -> Optional[str]:
     return None
 
 
+# Homoglyph attacks map visually similar characters onto their plain form
+# (e.g. '0' for 'o'). Built once with str.maketrans so normalization is a
+# single C-level translate() pass instead of chained replace() calls.
+_HOMOGLYPH_TABLE = str.maketrans({
+    '0': 'o',
+    '1': 'l',
+    'I': 'l',
+    '|': 'l',
+    '@': 'a',
+    '3': 'e',
+})
+
+
 def _is_typosquat_pattern(approved: str, suspect: str) -> bool:
     """Check for common typosquat patterns."""
     # Check if difference is a single character substitution
@@ -134,18 +288,7 @@ def _is_typosquat_pattern(approved: str, suspect: str) -> bool:
             return True
 
     # Check homoglyph attacks (visually similar characters)
-    homoglyphs = {
-        'o': ['0'],
-        'l': ['1', 'I', '|'],
-        'i': ['1', 'l', '|'],
-        'a': ['@'],
-        'e': ['3'],
-    }
-
-    normalized_suspect = suspect
-    for char, substitutes in homoglyphs.items():
-        for sub in substitutes:
-            normalized_suspect = normalized_suspect.replace(sub, char)
+    normalized_suspect = suspect.translate(_HOMOGLYPH_TABLE)
 
     if approved == normalized_suspect and approved != suspect:
         return True
@@ -153,68 +296,108 @@ def _is_typosquat_pattern(approved: str, suspect: str) -> bool:
     return False
 
 
-def _compute_tool_fingerprint(tool: Tool) -> str:
-    """Compute a fingerprint for a tool based on its metadata."""
-    desc = tool.description if tool.description else ""
-    content = f"{tool.name}|{desc}|{tool.input_schema}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
-
+# Fresh sha256 state cloned per fingerprint; copying an existing hasher is
+# cheaper than constructing one through the hashlib factory each call.
+_fingerprint_hasher = hashlib.sha256()
 
-def _check_tool_mimicry(server_name: str, tools: list[Tool]) -> Optional[dict]:
-    """Check if tools mimic trusted server tools."""
-    whitelist = _get_whitelist()
-    server_lower = server_name.lower()
 
-    for tool in tools:
-        for entry in whitelist:
-            entry_name = entry.get("name", "").lower()
-            if entry_name == server_lower:
-                continue
-
-            # Check tool fingerprints
-            tool_fingerprints = entry.get("tool_fingerprints", {})
-            fingerprint = _compute_tool_fingerprint(tool)
-
-            for trusted_name, trusted_fp in tool_fingerprints.items():
-                if fingerprint == trusted_fp:
-                    return {
-                        "tool_name": tool.name,
-                        "mimics_server": entry.get("name"),
-                        "mimics_tool": trusted_name,
-                        "match_type": "exact_fingerprint",
-                    }
-
-                if tool.name.lower() == trusted_name.lower():
-                    return {
-                        "tool_name": tool.name,
-                        "mimics_server": entry.get("name"),
-                        "mimics_tool": trusted_name,
-                        "match_type": "name_collision",
-                    }
+def _compute_tool_fingerprint(tool: Tool) -> str:
+    """Compute a fingerprint for a tool based on its metadata."""
+    h = _fingerprint_hasher.copy()
+    h.update(tool.name.encode())
+    h.update(b"|")
+    if tool.description:
+        h.update(tool.description.encode())
+    h.update(b"|")
+    h.update(tool.input_schema.encode())
+    # First 8 bytes hex-encoded == previous hexdigest()[:16], without
+    # building and slicing the full 64-char hex string.
+    return h.digest()[:8].hex()
+
+
+def _get_trusted_tool_indexes() -> tuple[dict[str, tuple[str, str]], dict[str, list[tuple[str, str]]]]:
+    """Get reverse maps over the whitelist's trusted tool fingerprints.
+
+    Built once per config load: fingerprint -> (server, tool) and
+    lowercased tool name -> [(server, tool)], so mimicry checks are O(1)
+    dict lookups instead of a scan over every whitelist entry per tool.
+    """
+    global _trusted_fp_index, _trusted_name_index
+    if _trusted_fp_index is None:
+        _trusted_fp_index = {}
+        _trusted_name_index = {}
+        for entry in _get_whitelist():
+            entry_name = entry.get("name", "")
+            for trusted_name, trusted_fp in entry.get("tool_fingerprints", {}).items():
+                _trusted_fp_index[trusted_fp] = (entry_name, trusted_name)
+                _trusted_name_index.setdefault(trusted_name.lower(), []).append(
+                    (entry_name, trusted_name)
+                )
+    return _trusted_fp_index, _trusted_name_index
+
+
+def _check_tool_mimicry(
+    server_lower: str, tools: list[Tool], fingerprints: list[str]
+) -> Optional[dict]:
+    """Check if tools mimic trusted server tools.
+
+    `fingerprints` is parallel to `tools`, computed once by the caller so
+    the same hashes are reused for registration.
+    """
+    fp_index, name_index = _get_trusted_tool_indexes()
+    if not fp_index and not name_index:
+        return None
+
+    for tool, fingerprint in zip(tools, fingerprints):
+        match = fp_index.get(fingerprint)
+        if match and match[0].lower() != server_lower:
+            return {
+                "tool_name": tool.name,
+                "mimics_server": match[0],
+                "mimics_tool": match[1],
+                "match_type": "exact_fingerprint",
+            }
+
+        for entry_name, trusted_name in name_index.get(tool.name.lower(), ()):
+            if entry_name.lower() != server_lower:
+                return {
+                    "tool_name": tool.name,
+                    "mimics_server": entry_name,
+                    "mimics_tool": trusted_name,
+                    "match_type": "name_collision",
+                }
 
     return None
 
 
-def _check_namespace_collision(server_name: str, tools: list[Tool]) -> Optional[dict]:
+def _check_namespace_collision(
+    server_name: str, server_lower: str, tools: list[Tool]
+) -> Optional[dict]:
     """Check for tool name collisions with other registered servers."""
-    global _tool_registry
-    server_lower = server_name.lower()
-
     for tool in tools:
-        for other_server, other_tools in _tool_registry.items():
-            if other_server.lower() == server_lower:
-                continue
-
-            if tool.name in other_tools:
-                return {
-                    "tool_name": tool.name,
-                    "this_server": server_name,
-                    "other_server": other_server,
-                }
+        owner = _registry_tool_owners.get(tool.name)
+        if owner is not None and owner.lower() != server_lower:
+            return {
+                "tool_name": tool.name,
+                "this_server": server_name,
+                "other_server": owner,
+            }
 
     return None
 
 
+def _register_tools(server_name: str, tool_fingerprints: dict[str, str]) -> None:
+    """Record a server's tools in the registry and the owner reverse index."""
+    previous = _tool_registry.get(server_name)
+    if previous:
+        for name in previous:
+            if _registry_tool_owners.get(name) == server_name:
+                del _registry_tool_owners[name]
+    _tool_registry[server_name] = tool_fingerprints
+    for name in tool_fingerprints:
+        _registry_tool_owners[name] = server_name
+
+
 class Guard:
     """
     Server Spoofing Guard - WASM implementation.
@@ -229,26 +412,33 @@ class Guard:
         server_name = context.server_name
         config = _get_config()
 
-        host.log(1, f"Evaluating server connection: {server_name}")
-
-        # Check if whitelisting is enabled
+        # Whitelisting disabled: every check below is whitelist-derived,
+        # so return before doing any logging or normalization work.
         if not config.get("whitelist_enabled", True):
             return Decision_Allow()
 
-        # Check whitelist
-        if _is_whitelisted(server_name):
+        host.log(1, f"Evaluating server connection: {server_name}")
+
+        # Normalize once; every check below works on the lowercased name
+        server_lower = server_name.lower()
+
+        # Check whitelist (by name, then by URL pattern like the native guard)
+        if _is_whitelisted(server_lower):
             host.log(1, f"Server '{server_name}' is whitelisted")
             return Decision_Allow()
+        if context.server_url and _matches_url_pattern(context.server_url):
+            host.log(1, f"Server '{server_name}' matched a whitelisted URL pattern")
+            return Decision_Allow()
 
         # Check for typosquat
         if config.get("typosquat_detection_enabled", True):
-            typosquat_match = _detect_typosquat(server_name)
+            typosquat_match = _detect_typosquat(server_lower)
             if typosquat_match:
                 host.log(3, f"Typosquat detected: '{server_name}' similar to '{typosquat_match}'")
                 return Decision_Deny(DenyReason(
                     code="typosquat_detected",
                     message=f"Server '{server_name}' appears to be typosquatting approved server '{typosquat_match}'",
-                    details=json.dumps({
+                    details=_dumps_details({
                         "detected_name": server_name,
                         "similar_to": typosquat_match,
                         "attack_type": "typosquatting",
@@ -261,7 +451,7 @@ class Guard:
             return Decision_Deny(DenyReason(
                 code="server_not_whitelisted",
                 message=f"Server '{server_name}' is not in the approved server registry",
-                details=json.dumps({
+                details=_dumps_details({
                     "server_name": server_name,
                     "action": "Add server to whitelist if this is a legitimate server",
                 }),
@@ -277,19 +467,24 @@ class Guard:
         """
         global _tool_registry
         server_name = context.server_name
+        server_lower = server_name.lower()
         config = _get_config()
 
         host.log(1, f"Evaluating {len(tools)} tools from server: {server_name}")
 
+        # Fingerprint each tool once; reused by the mimicry check and the
+        # registration pass below.
+        fingerprints = [_compute_tool_fingerprint(tool) for tool in tools]
+
         # Check for tool mimicry
         if config.get("tool_mimicry_detection_enabled", True):
-            mimicry = _check_tool_mimicry(server_name, tools)
+            mimicry = _check_tool_mimicry(server_lower, tools, fingerprints)
             if mimicry:
                 host.log(3, f"Tool mimicry detected: {mimicry}")
                 return Decision_Deny(DenyReason(
                     code="tool_mimicry_detected",
                     message=f"Server '{server_name}' contains tools that mimic trusted server tools",
-                    details=json.dumps({
+                    details=_dumps_details({
                         "server_name": server_name,
                         "mimicked_tools": [mimicry],
                         "attack_type": "tool_mimicry",
@@ -297,30 +492,36 @@ class Guard:
                 ))
 
         # Check for namespace collisions
-        collision = _check_namespace_collision(server_name, tools)
+        collision = _check_namespace_collision(server_name, server_lower, tools)
         if collision:
             host.log(3, f"Tool namespace collision: {collision}")
             return Decision_Deny(DenyReason(
                 code="tool_namespace_collision",
                 message=f"Server '{server_name}' has tools that collide with other servers",
-                details=json.dumps({
+                details=_dumps_details({
                     "collisions": [collision],
                     "recommendation": "Use namespaced tool names (e.g., server_name.tool_name)",
                 }),
             ))
 
-        # Register tools for this server
-        tool_fingerprints = {}
-        for tool in tools:
-            fingerprint = _compute_tool_fingerprint(tool)
-            tool_fingerprints[tool.name] = fingerprint
-        _tool_registry[server_name] = tool_fingerprints
+        # Register tools for this server (reusing the fingerprints above)
+        tool_fingerprints = {
+            tool.name: fingerprint for tool, fingerprint in zip(tools, fingerprints)
+        }
+        _register_tools(server_name, tool_fingerprints)
 
         host.log(1, f"Registered {len(tools)} tools for server: {server_name}")
         return Decision_Allow()
 
     def get_settings_schema(self) -> str:
-        """Return JSON Schema describing guard's configurable parameters."""
+        """Return JSON Schema describing guard's configurable parameters.
+
+        The schema is static, so it is serialized once and the JSON string
+        is reused on subsequent calls.
+        """
+        global _settings_schema_json
+        if _settings_schema_json is not None:
+            return _settings_schema_json
         schema = {
             "$schema": "https://json-schema.org/draft/2020-12/schema",
             "$id": "agentgateway://guards/server-spoofing/v1",
@@ -450,10 +651,14 @@ class Guard:
                 "icon": "shield-alert",
             },
         }
-        return json.dumps(schema)
+        _settings_schema_json = json.dumps(schema)
+        return _settings_schema_json
 
     def get_default_config(self) -> str:
-        """Return default configuration as JSON."""
+        """Return default configuration as JSON (serialized once)."""
+        global _default_config_json
+        if _default_config_json is not None:
+            return _default_config_json
         config = {
             "whitelist_enabled": True,
             "whitelist": [],
@@ -462,4 +667,5 @@ class Guard:
             "typosquat_similarity_threshold": 0.85,
             "tool_mimicry_detection_enabled": True,
         }
-        return json.dumps(config)
+        _default_config_json = json.dumps(config)
+        return _default_config_json
@@ -14,7 +14,9 @@ both WASI Preview 2 and the custom mcp:security-guard/host interface.
 The AgentGateway Rust runtime provides this.
 """
 
+import importlib.util
 import os
+import re
 import pytest
 from pathlib import Path
 
@@ -24,148 +26,241 @@ WASM_FILE = WASM_DIR / "server_spoofing_guard.wasm"
 WIT_FILE = WASM_DIR / "wit" / "guard.wit"
 APP_FILE = WASM_DIR / "app.py"
 
+# Evaluated once at collection so artifact-dependent classes skip without
+# paying any fixture setup (notably wasmtime Engine construction).
+_HAS_WASM = WASM_FILE.exists()
+_HAS_WASMTIME = importlib.util.find_spec("wasmtime") is not None
 
-class TestWasmStructure:
-    """Tests for WASM file structure and validity."""
+# WIT identifier tokenizer, compiled once at import rather than through
+# re's per-call cache lookup
+_WIT_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-]*:?")
 
-    def test_wasm_file_exists(self):
-        """WASM file should exist after build."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built. Run ./build.sh first")
-        assert WASM_FILE.exists()
+requires_wasm = pytest.mark.skipif(
+    not _HAS_WASM, reason="WASM file not built. Run ./build.sh first"
+)
+requires_wasmtime = pytest.mark.skipif(
+    not _HAS_WASMTIME, reason="wasmtime not installed"
+)
 
-    def test_wasm_file_has_correct_magic(self):
-        """WASM file should have correct magic bytes."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
 
-        with open(WASM_FILE, "rb") as f:
-            magic = f.read(4)
+def _host_log(level, message):
+    """No-op host log for test instantiation."""
 
-        # WASM magic: \0asm
-        assert magic == b"\x00asm", f"Invalid WASM magic: {magic}"
 
-    def test_wasm_file_reasonable_size(self):
-        """WASM file should be reasonable size (10MB - 100MB for Python component)."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
+def _host_get_time():
+    return 0
 
-        size_mb = WASM_FILE.stat().st_size / (1024 * 1024)
-        assert 10 < size_mb < 100, f"Unexpected size: {size_mb:.1f}MB"
 
+def _host_get_config(key):
+    return ""
 
-class TestWasmLoading:
-    """Tests for WASM component loading with wasmtime."""
 
-    @pytest.fixture
-    def engine(self):
-        """Create wasmtime engine with component model enabled."""
-        try:
-            from wasmtime import Engine, Config
-            config = Config()
-            config.wasm_component_model = True
-            return Engine(config)
-        except ImportError:
-            pytest.skip("wasmtime not installed")
-
-    def test_component_loads(self, engine):
-        """Component should load successfully."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
+def _add_host_interface(linker):
+    """Register the mcp:security-guard host interface on a linker.
 
-        from wasmtime.component import Component
-        component = Component.from_file(engine, str(WASM_FILE))
-        assert component is not None
+    The host functions are module-level defs registered by reference, so
+    repeated instantiations reuse the same FFI trampolines instead of
+    boxing fresh closures each time.
+    """
+    host_instance = linker.root().add_instance("mcp:security-guard/host@0.1.0")
+    host_instance.add_func("log", _host_log)
+    host_instance.add_func("get-time", _host_get_time)
+    host_instance.add_func("get-config", _host_get_config)
+    del host_instance
 
-    def test_component_has_guard_export(self, engine):
-        """Component should export the guard interface."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
 
-        from wasmtime.component import Component
-        component = Component.from_file(engine, str(WASM_FILE))
-        comp_type = component.type
+def _missing_tokens(content: str, tokens: tuple) -> list:
+    """Return the tokens absent from content, using one alternation scan.
 
-        exports = [str(e) for e in comp_type.exports(engine)]
-        assert "mcp:security-guard/guard@0.1.0" in exports, f"Exports: {exports}"
+    A single compiled-regex pass replaces N separate substring scans over
+    the same (multi-KB) source text.
+    """
+    pattern = re.compile("|".join(re.escape(t) for t in tokens))
+    found = {m.group(0) for m in pattern.finditer(content)}
+    return [t for t in tokens if t not in found]
 
-    def test_component_imports_host_interface(self, engine):
-        """Component should import our custom host interface."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
 
-        from wasmtime.component import Component
-        component = Component.from_file(engine, str(WASM_FILE))
-        comp_type = component.type
+@pytest.fixture(scope="session")
+def engine():
+    """Create one wasmtime engine with component model enabled.
 
-        imports = [str(i) for i in comp_type.imports(engine)]
-        assert "mcp:security-guard/host@0.1.0" in imports, f"Imports: {imports}"
+    Session-scoped: engine construction (and the compilation cache behind
+    it) is shared by every test instead of being rebuilt per test.
+    """
+    pytest.importorskip("wasmtime")
+    from wasmtime import Engine, Config
 
-    def test_component_imports_wasi(self, engine):
-        """Component should import WASI interfaces."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
+    config = Config()
+    config.wasm_component_model = True
+    # Explicit Cranelift profile: "speed" keeps the generated code fast
+    # enough for the bundled CPython interpreter without the compile-time
+    # cost of speed_and_size, and debug info is dead weight in tests.
+    config.strategy = "cranelift"
+    config.cranelift_opt_level = "speed"
+    config.debug_info = False
+    return Engine(config)
 
-        from wasmtime.component import Component
-        component = Component.from_file(engine, str(WASM_FILE))
-        comp_type = component.type
 
-        imports = [str(i) for i in comp_type.imports(engine)]
-        wasi_imports = [i for i in imports if i.startswith("wasi:")]
-        assert len(wasi_imports) > 0, "Should have WASI imports"
+@pytest.fixture(scope="session")
+def component(engine):
+    """Load the WASM component once for the whole session.
 
-    def test_component_instantiates_with_wasi(self, engine):
-        """Component should instantiate when WASI and host are provided."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
+    Cranelift compilation of the ~30MB Python component dominates test
+    startup, so the compiled form is cached next to the artifact as a
+    .cwasm (gitignored, like the .wasm itself) and deserialized on
+    subsequent sessions while the source artifact is unchanged.
+    """
+    if not WASM_FILE.exists():
+        pytest.skip("WASM file not built. Run ./build.sh first")
+    from wasmtime.component import Component
 
-        from wasmtime import Store
-        from wasmtime.component import Component, Linker
+    cwasm = WASM_FILE.with_suffix(".cwasm")
+    if cwasm.exists() and cwasm.stat().st_mtime >= WASM_FILE.stat().st_mtime:
+        try:
+            return Component.deserialize_file(engine, str(cwasm))
+        except Exception:
+            # Stale or incompatible precompile (e.g. wasmtime upgrade):
+            # fall through and recompile from the component itself.
+            pass
+
+    component = Component.from_file(engine, str(WASM_FILE))
+    try:
+        cwasm.write_bytes(component.serialize())
+    except Exception:
+        pass  # caching is best-effort; never fail the suite over it
+    return component
+
+
+@pytest.fixture(scope="session")
+def component_io(engine, component):
+    """Materialize the component's import/export names once.
+
+    component.type walks the (LEB128-encoded) type section; four tests
+    previously re-walked it and re-stringified the iterators.
+    """
+    comp_type = component.type
+    return {
+        "imports": frozenset(str(i) for i in comp_type.imports(engine)),
+        "exports": frozenset(str(e) for e in comp_type.exports(engine)),
+    }
+
+
+@pytest.fixture(scope="session")
+def instance(engine, component):
+    """Instantiate the component once with WASI + host interface wired up.
+
+    Instantiating a Python-hosting component is the most expensive step
+    after compilation; the two instantiation-based tests share one
+    (store, instance) pair rather than each rebuilding the linker.
+    """
+    from wasmtime import Store
+    from wasmtime.component import Linker
+
+    store = Store(engine)
+    linker = Linker(engine)
+    linker.add_wasip2()
+    _add_host_interface(linker)
+
+    return store, linker.instantiate(store, component)
+
+
+@pytest.fixture(scope="session")
+def wasm_header():
+    """Stat and read the WASM magic once for the structure tests.
+
+    The artifact is 10-100MB; one open/stat serves all tests instead of
+    each hitting the (possibly network-mounted) filesystem.
+    """
+    if not WASM_FILE.exists():
+        pytest.skip("WASM file not built. Run ./build.sh first")
+    with open(WASM_FILE, "rb") as f:
+        magic = f.read(4)
+    return {"magic": magic, "size": WASM_FILE.stat().st_size}
+
+
+@pytest.fixture(scope="session")
+def app_content():
+    """Read app.py once; a dozen tests assert against its contents."""
+    return APP_FILE.read_text()
+
+
+@pytest.fixture(scope="session")
+def wit_tokens():
+    """Tokenize guard.wit once; membership checks become hash lookups.
+
+    The set holds every word (with and without a trailing colon, so
+    "log:" and "get-settings-schema" both resolve) plus adjacent-word
+    bigrams for declarations like "interface guard" and "record tool".
+    """
+    words = _WIT_WORD_RE.findall(WIT_FILE.read_text())
+    stripped = [w.rstrip(":") for w in words]
+    tokens = set(words)
+    tokens.update(stripped)
+    tokens.update(f"{a} {b}" for a, b in zip(stripped, stripped[1:]))
+    return tokens
+
+
+@requires_wasm
+class TestWasmStructure:
+    """Tests for WASM file structure and validity."""
 
-        store = Store(engine)
-        linker = Linker(engine)
-        linker.add_wasip2()
+    def test_wasm_file_exists(self, wasm_header):
+        """WASM file should exist after build."""
+        assert wasm_header["size"] > 0
 
-        # Add our custom host interface
-        host_instance = linker.root().add_instance("mcp:security-guard/host@0.1.0")
-        host_instance.add_func("log", lambda level, msg: None)
-        host_instance.add_func("get-time", lambda: 0)
-        host_instance.add_func("get-config", lambda key: "")
-        del host_instance
+    def test_wasm_file_has_correct_magic(self, wasm_header):
+        """WASM file should have correct magic bytes."""
+        # WASM magic: \0asm
+        assert wasm_header["magic"] == b"\x00asm", (
+            f"Invalid WASM magic: {wasm_header['magic']}"
+        )
 
-        component = Component.from_file(engine, str(WASM_FILE))
-        instance = linker.instantiate(store, component)
-        assert instance is not None
+    def test_wasm_file_reasonable_size(self, wasm_header):
+        """WASM file should be reasonable size (10MB - 100MB for Python component)."""
+        size_mb = wasm_header["size"] / (1024 * 1024)
+        assert 10 < size_mb < 100, f"Unexpected size: {size_mb:.1f}MB"
 
 
-    def test_component_exports_schema_functions(self, engine):
-        """Component should export get-settings-schema and get-default-config."""
-        if not WASM_FILE.exists():
-            pytest.skip("WASM file not built")
+@requires_wasm
+@requires_wasmtime
+class TestWasmLoading:
+    """Tests for WASM component loading with wasmtime."""
 
-        from wasmtime import Store
-        from wasmtime.component import Component, Linker
+    def test_component_loads(self, component):
+        """Component should load successfully."""
+        assert component is not None
 
-        store = Store(engine)
-        linker = Linker(engine)
-        linker.add_wasip2()
+    def test_component_has_guard_export(self, component_io):
+        """Component should export the guard interface."""
+        exports = component_io["exports"]
+        assert "mcp:security-guard/guard@0.1.0" in exports, f"Exports: {sorted(exports)}"
 
-        host_instance = linker.root().add_instance("mcp:security-guard/host@0.1.0")
-        host_instance.add_func("log", lambda level, msg: None)
-        host_instance.add_func("get-time", lambda: 0)
-        host_instance.add_func("get-config", lambda key: "")
-        del host_instance
+    def test_component_imports_host_interface(self, component_io):
+        """Component should import our custom host interface."""
+        imports = component_io["imports"]
+        assert "mcp:security-guard/host@0.1.0" in imports, f"Imports: {sorted(imports)}"
 
-        component = Component.from_file(engine, str(WASM_FILE))
-        instance = linker.instantiate(store, component)
+    def test_component_imports_wasi(self, component_io):
+        """Component should import WASI interfaces."""
+        wasi_imports = [i for i in component_io["imports"] if i.startswith("wasi:")]
+        assert len(wasi_imports) > 0, "Should have WASI imports"
+
+    def test_component_instantiates_with_wasi(self, instance):
+        """Component should instantiate when WASI and host are provided."""
+        store, inst = instance
+        assert inst is not None
 
-        guard_idx = instance.get_export(store, None, "mcp:security-guard/guard@0.1.0")
+    def test_component_exports_schema_functions(self, instance):
+        """Component should export get-settings-schema and get-default-config."""
+        store, inst = instance
+
+        guard_idx = inst.get_export(store, None, "mcp:security-guard/guard@0.1.0")
         assert guard_idx is not None, "Guard interface not found"
 
-        schema_idx = instance.get_export(store, guard_idx, "get-settings-schema")
+        schema_idx = inst.get_export(store, guard_idx, "get-settings-schema")
         assert schema_idx is not None, "get-settings-schema not found in guard exports"
 
-        config_idx = instance.get_export(store, guard_idx, "get-default-config")
+        config_idx = inst.get_export(store, guard_idx, "get-default-config")
         assert config_idx is not None, "get-default-config not found in guard exports"
 
 
@@ -176,46 +271,35 @@ class TestWitInterface:
         """WIT interface file should exist."""
         assert WIT_FILE.exists()
 
-    def test_wit_defines_guard_interface(self):
-        """WIT should define guard interface with required functions."""
-        content = WIT_FILE.read_text()
-
-        assert "interface guard" in content
-        assert "evaluate-server-connection" in content
-        assert "evaluate-tools-list" in content
-
-    def test_wit_defines_required_types(self):
-        """WIT should define all required types."""
-        content = WIT_FILE.read_text()
-
-        assert "record tool" in content
-        assert "record guard-context" in content
-        assert "variant decision" in content
-        assert "record deny-reason" in content
-
-    def test_wit_defines_schema_functions(self):
-        """WIT should define get-settings-schema and get-default-config functions."""
-        content = WIT_FILE.read_text()
-
-        assert "get-settings-schema" in content
-        assert "get-default-config" in content
-
-    def test_wit_defines_host_interface(self):
-        """WIT should define host interface with required functions."""
-        content = WIT_FILE.read_text()
-
-        assert "interface host" in content
-        assert "log:" in content
-        assert "get-time:" in content
-        assert "get-config:" in content
-
-    def test_wit_defines_world(self):
-        """WIT should define the security-guard world."""
-        content = WIT_FILE.read_text()
-
-        assert "world security-guard" in content
-        assert "export guard" in content
-        assert "import host" in content
+    @pytest.mark.parametrize(
+        "tokens",
+        [
+            pytest.param(
+                ("interface guard", "evaluate-server-connection", "evaluate-tools-list"),
+                id="guard-interface",
+            ),
+            pytest.param(
+                ("record tool", "record guard-context", "variant decision", "record deny-reason"),
+                id="required-types",
+            ),
+            pytest.param(
+                ("get-settings-schema", "get-default-config"),
+                id="schema-functions",
+            ),
+            pytest.param(
+                ("interface host", "log:", "get-time:", "get-config:"),
+                id="host-interface",
+            ),
+            pytest.param(
+                ("world security-guard", "export guard", "import host"),
+                id="world",
+            ),
+        ],
+    )
+    def test_wit_defines(self, wit_tokens, tokens):
+        """WIT should define the guard/host interfaces, types, and world."""
+        missing = [t for t in tokens if t not in wit_tokens]
+        assert not missing, f"guard.wit missing: {missing}"
 
 
 class TestBuildArtifacts:
@@ -231,24 +315,27 @@ class TestBuildArtifacts:
         """Main application file should exist."""
         assert APP_FILE.exists()
 
-    def test_app_py_defines_guard_class(self):
-        """app.py should define Guard class with required methods."""
-        content = APP_FILE.read_text()
-
-        assert "class Guard:" in content
-        assert "def evaluate_server_connection" in content
-        assert "def evaluate_tools_list" in content
-
-    def test_app_py_defines_schema_methods(self):
-        """app.py should define get_settings_schema and get_default_config methods."""
-        content = APP_FILE.read_text()
-
-        assert "def get_settings_schema" in content
-        assert "def get_default_config" in content
-
-    def test_app_py_implements_detection_algorithms(self):
+    @pytest.mark.parametrize(
+        "tokens",
+        [
+            pytest.param(
+                ("class Guard:", "def evaluate_server_connection", "def evaluate_tools_list"),
+                id="guard-class",
+            ),
+            pytest.param(
+                ("def get_settings_schema", "def get_default_config"),
+                id="schema-methods",
+            ),
+        ],
+    )
+    def test_app_py_defines(self, app_content, tokens):
+        """app.py should define the Guard class and schema entry points."""
+        missing = _missing_tokens(app_content, tokens)
+        assert not missing, f"app.py missing: {missing}"
+
+    def test_app_py_implements_detection_algorithms(self, app_content):
         """app.py should implement the core detection algorithms."""
-        content = APP_FILE.read_text()
+        content = app_content
 
         # Levenshtein for typosquat detection
         assert "levenshtein_ratio" in content
@@ -272,62 +359,48 @@ class TestBuildArtifacts:
 class TestSchemaAndConfig:
     """Tests for get_settings_schema and get_default_config outputs."""
 
-    def test_settings_schema_is_valid_json_structure(self):
-        """get_settings_schema should contain valid JSON Schema markers."""
-        content = APP_FILE.read_text()
-        assert "get_settings_schema" in content
-        assert '"$schema"' in content
-        assert '"https://json-schema.org/draft/2020-12/schema"' in content
-
-    def test_settings_schema_has_required_fields(self):
-        """Schema JSON should contain all required top-level fields."""
-        content = APP_FILE.read_text()
-
-        assert '"$id"' in content
-        assert '"title"' in content
-        assert '"properties"' in content
-        assert '"x-guard-meta"' in content
-        assert '"guardType"' in content
-        assert '"server_spoofing"' in content
-
-    def test_settings_schema_has_all_config_properties(self):
-        """Schema should describe all configurable properties."""
-        content = APP_FILE.read_text()
-
-        assert '"whitelist_enabled"' in content
-        assert '"whitelist"' in content
-        assert '"block_unknown_servers"' in content
-        assert '"typosquat_detection_enabled"' in content
-        assert '"typosquat_similarity_threshold"' in content
-        assert '"tool_mimicry_detection_enabled"' in content
-
-    def test_settings_schema_has_ui_hints(self):
-        """Schema properties should include x-ui hints."""
-        content = APP_FILE.read_text()
-
-        assert '"x-ui"' in content
-        assert '"component"' in content
-        assert '"order"' in content
-
-    def test_settings_schema_has_ui_groups(self):
-        """Schema should define x-ui-groups for property grouping."""
-        content = APP_FILE.read_text()
-
-        assert '"x-ui-groups"' in content
-        assert '"whitelist"' in content
-        assert '"typosquat"' in content
-        assert '"mimicry"' in content
-
-    def test_default_config_has_all_keys(self):
-        """get_default_config should return JSON with all config keys."""
-        content = APP_FILE.read_text()
-        assert "get_default_config" in content
-        assert '"whitelist_enabled"' in content
-        assert '"typosquat_similarity_threshold"' in content
-
-    def test_schema_and_config_consistency(self):
+    @pytest.mark.parametrize(
+        "tokens",
+        [
+            pytest.param(
+                ("get_settings_schema", '"$schema"',
+                 '"https://json-schema.org/draft/2020-12/schema"'),
+                id="json-schema-markers",
+            ),
+            pytest.param(
+                ('"$id"', '"title"', '"properties"',
+                 '"x-guard-meta"', '"guardType"', '"server_spoofing"'),
+                id="required-fields",
+            ),
+            pytest.param(
+                ('"whitelist_enabled"', '"whitelist"', '"block_unknown_servers"',
+                 '"typosquat_detection_enabled"', '"typosquat_similarity_threshold"',
+                 '"tool_mimicry_detection_enabled"'),
+                id="config-properties",
+            ),
+            pytest.param(
+                ('"x-ui"', '"component"', '"order"'),
+                id="ui-hints",
+            ),
+            pytest.param(
+                ('"x-ui-groups"', '"whitelist"', '"typosquat"', '"mimicry"'),
+                id="ui-groups",
+            ),
+            pytest.param(
+                ("get_default_config", '"whitelist_enabled"',
+                 '"typosquat_similarity_threshold"'),
+                id="default-config-keys",
+            ),
+        ],
+    )
+    def test_schema_contains(self, app_content, tokens):
+        """Schema and default config JSON should contain all expected keys."""
+        missing = _missing_tokens(app_content, tokens)
+        assert not missing, f"schema missing: {missing}"
+
+    def test_schema_and_config_consistency(self, app_content):
         """Default config keys should match schema property keys."""
-        content = APP_FILE.read_text()
+        content = app_content
 
         config_properties = [
             "whitelist_enabled",
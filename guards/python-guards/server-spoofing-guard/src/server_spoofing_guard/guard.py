@@ -11,6 +11,8 @@ Protects against:
 Reference: UNITONE Gateway Security Capabilities v1.0 - Capability #4
 """
 
+import asyncio
+import functools
 import re
 import hashlib
 import ssl
@@ -20,29 +22,86 @@ from urllib.parse import urlparse
 import logging
 
 try:
-    from Levenshtein import ratio as levenshtein_ratio
-except ImportError:
-    # Fallback implementation if python-Levenshtein not installed
-    def levenshtein_ratio(s1: str, s2: str) -> float:
+    # Preferred: rapidfuzz's SIMD bit-parallel Myers kernel (C++)
+    from rapidfuzz import process as _rf_process
+    from rapidfuzz.distance.Levenshtein import (
+        normalized_similarity as _rf_normalized_similarity,
+    )
+
+    from rapidfuzz.distance.Levenshtein import distance as levenshtein_distance
+
+    def levenshtein_ratio(
+        s1: str, s2: str, score_cutoff: Optional[float] = None
+    ) -> float:
+        # score_cutoff lets the C++ kernel bail out of a comparison as
+        # soon as the similarity provably falls below it (returns 0.0)
         if not s1 or not s2:
             return 0.0
-        if s1 == s2:
-            return 1.0
-        len1, len2 = len(s1), len(s2)
-        if len1 < len2:
-            s1, s2 = s2, s1
-            len1, len2 = len2, len1
-        distances = range(len2 + 1)
-        for i1, c1 in enumerate(s1):
-            new_distances = [i1 + 1]
-            for i2, c2 in enumerate(s2):
-                if c1 == c2:
-                    new_distances.append(distances[i2])
-                else:
-                    new_distances.append(1 + min((distances[i2], distances[i2 + 1], new_distances[-1])))
-            distances = new_distances
-        distance = distances[-1]
-        return 1.0 - (distance / max(len1, len2))
+        return _rf_normalized_similarity(s1, s2, score_cutoff=score_cutoff)
+
+except ImportError:
+    _rf_process = None
+    try:
+        from Levenshtein import ratio as _lev_ratio
+        from Levenshtein import distance as levenshtein_distance
+
+        def levenshtein_ratio(
+            s1: str, s2: str, score_cutoff: Optional[float] = None
+        ) -> float:
+            return _lev_ratio(s1, s2)
+
+    except ImportError:
+        # Fallback if neither rapidfuzz nor python-Levenshtein is
+        # installed: Myers' bit-parallel algorithm. The shorter string is
+        # packed into per-character bitmasks and each character of the
+        # longer string costs a constant number of word operations on the
+        # VP/VN delta vectors, so the O(m*n) DP collapses to O(m) bitwise
+        # steps for names that fit a machine word.
+        def levenshtein_ratio(
+            s1: str, s2: str, score_cutoff: Optional[float] = None
+        ) -> float:
+            if not s1 or not s2:
+                return 0.0
+            if s1 == s2:
+                return 1.0
+            len1, len2 = len(s1), len(s2)
+            if len1 < len2:
+                s1, s2 = s2, s1
+                len1, len2 = len2, len1
+
+            peq: dict[str, int] = {}
+            for i, c in enumerate(s2):
+                peq[c] = peq.get(c, 0) | (1 << i)
+
+            mask = (1 << len2) - 1
+            msb = 1 << (len2 - 1)
+            vp = mask  # vertical positive deltas
+            vn = 0     # vertical negative deltas
+            score = len2
+            peq_get = peq.get
+
+            for c in s1:
+                x = peq_get(c, 0) | vn
+                d0 = (((x & vp) + vp) ^ vp) | x
+                hn = vp & d0
+                hp = vn | (~(vp | d0) & mask)
+                if hp & msb:
+                    score += 1
+                elif hn & msb:
+                    score -= 1
+                x = ((hp << 1) | 1) & mask
+                vn = x & d0
+                vp = ((hn << 1) & mask) | (~(x | d0) & mask)
+
+            return 1.0 - (score / len1)
+
+        def levenshtein_distance(s1: str, s2: str) -> int:
+            if s1 == s2:
+                return 0
+            if not s1 or not s2:
+                return len(s1) or len(s2)
+            # ratio is exactly 1 - d/max_len, so round() recovers d
+            return round((1.0 - levenshtein_ratio(s1, s2)) * max(len(s1), len(s2)))
 
 from .models import (
     Tool,
@@ -54,6 +113,130 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Base hasher cloned per fingerprint; copy() skips hashlib's constructor
+# and OpenSSL context setup on every call. The algorithm stays sha256:
+# operators pin tool_fingerprints in whitelist config and the WASM guard
+# computes the same digests, so swapping in blake2b/blake3 would silently
+# invalidate every pinned fingerprint. OpenSSL dispatches to SHA-NI on
+# x86 anyway, so the delta for short tool descriptors is negligible.
+_FINGERPRINT_HASHER = hashlib.sha256()
+
+# Homoglyph normalization as one C-level translate call. The table is the
+# composition of the previous sequential str.replace pipeline over the
+# homoglyph map (the 'i' row rewrote 'l' after the 'l' row had run, so
+# 1/I/|/l all collapse to 'i'); behavior is unchanged.
+_HOMOGLYPH_TABLE = str.maketrans({
+    "0": "o", "ο": "o",  # zero / Greek omicron -> Latin o
+    "1": "i", "I": "i", "|": "i", "l": "i",
+    "@": "a", "α": "a",  # at sign / Greek alpha -> a
+    "3": "e", "е": "e",  # three / Cyrillic е -> e
+})
+
+
+# Interning table for compiled whitelist URL patterns: entries sharing a
+# pattern string share one Pattern object, and the URL scan can skip
+# re-matching a pattern it has already tried.
+_pattern_cache: dict[str, re.Pattern] = {}
+
+# Numbered (\1) and named ((?P=name)) backreferences are renumbered when
+# patterns are wrapped into one alternation, silently changing what they
+# match; such patterns keep the sequential scan instead of being fused.
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@functools.lru_cache(maxsize=1024)
+def _parsed_url(server_url: str) -> tuple[str, str, int]:
+    """Parse a server URL into (scheme, hostname, port), LRU-cached.
+
+    Health checks hit the same handful of URLs repeatedly; caching skips
+    re-running urlparse per request while the LRU bound keeps one-off
+    URLs from growing the cache unboundedly.
+    """
+    parsed = urlparse(server_url)
+    return (
+        parsed.scheme,
+        parsed.hostname or "",
+        parsed.port or (443 if parsed.scheme == "https" else 80),
+    )
+
+
+def _count_diffs(a: str, b: str) -> int:
+    """Count differing positions between two equal-length names.
+
+    ASCII names pack into ints so one XOR plus a SWAR collapse (every
+    nonzero byte folds onto its low bit) and int.bit_count() replace the
+    per-character generator scan; non-ASCII names keep the scan.
+    """
+    if a.isascii() and b.isascii():
+        d = int.from_bytes(a.encode(), "little") ^ int.from_bytes(b.encode(), "little")
+        if d == 0:
+            return 0
+        # Total shift is 7 (< 8), so bytes never contaminate each other.
+        d |= d >> 4
+        d |= d >> 2
+        d |= d >> 1
+        ones = int.from_bytes(b"\x01" * len(a), "little")
+        return (d & ones).bit_count()
+    return sum(1 for x, y in zip(a, b) if x != y)
+
+
+# Below this size a linear rapidfuzz scan beats tree traversal overhead,
+# so the BK-tree is only built for large whitelists.
+_BKTREE_MIN_ENTRIES = 32
+
+# Cap on memoized typosquat verdicts; bounds memory when an attacker
+# cycles through many distinct names.
+_TYPOSQUAT_CACHE_MAX = 1024
+
+# Sentinel distinguishing "not cached" from a cached None verdict.
+_CACHE_MISS = object()
+
+
+class _BKTree:
+    """Minimal BK-tree over whitelist names for radius queries.
+
+    Children are keyed by edit distance to their parent, so a radius
+    query only descends branches whose distance band can still contain a
+    hit (triangle inequality) -- sublinear for large name sets. Values
+    are whitelist indexes so callers can preserve scan order.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self) -> None:
+        self._root: Optional[list] = None  # [name, index, {distance: child}]
+
+    def add(self, name: str, index: int) -> None:
+        if self._root is None:
+            self._root = [name, index, {}]
+            return
+        node = self._root
+        while True:
+            dist = levenshtein_distance(name, node[0])
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [name, index, {}]
+                return
+            node = child
+
+    def query(self, name: str, radius: int) -> list[int]:
+        """Return indexes of names within `radius` edits of `name`."""
+        if self._root is None or radius < 0:
+            return []
+        hits: list[int] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            dist = levenshtein_distance(name, node[0])
+            if dist <= radius:
+                hits.append(node[1])
+            children = node[2]
+            for d in range(dist - radius, dist + radius + 1):
+                child = children.get(d)
+                if child is not None:
+                    stack.append(child)
+        return hits
+
 
 class ServerSpoofingGuard:
     """
@@ -69,6 +252,107 @@ class ServerSpoofingGuard:
     def __init__(self, config: Optional[ServerConfig] = None):
         self.config = config or ServerConfig()
         self._tool_registry: dict[str, dict[str, str]] = {}  # server -> {tool_name: fingerprint}
+        self._tool_owners: dict[str, list[str]] = {}  # tool name -> servers offering it
+        # Shared verification context plus cached TLS sessions so repeat
+        # health checks use abbreviated handshakes (1 RTT, no asymmetric
+        # crypto) instead of a full handshake per call.
+        self._ssl_context = ssl.create_default_context()
+        self._tls_sessions: dict[tuple[str, int], ssl.SSLSession] = {}
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild indexes derived from the whitelist.
+
+        Called on construction and after whitelist mutation so the hot
+        evaluation paths do O(1) lookups instead of rescanning (and
+        re-lowercasing) the entry list per call.
+        """
+        whitelist = self.config.whitelist
+        # Exact-name lookups are O(1) through this index; the whitelist
+        # list is kept for regex matching and typosquat scan ordering.
+        self._by_name: dict[str, WhitelistEntry] = {
+            e.name.lower(): e for e in whitelist
+        }
+        # (lowercase name, original name) pairs for the typosquat scan
+        self._lower_names: list[tuple[str, str]] = [
+            (e.name.lower(), e.name) for e in whitelist
+        ]
+        # fingerprint -> (server, tool) and lowercase tool name ->
+        # [(server, tool)] reverse indexes for mimicry detection
+        self._trusted_fp_index: dict[str, tuple[str, str]] = {}
+        self._trusted_name_index: dict[str, list[tuple[str, str]]] = {}
+        for entry in whitelist:
+            for tool_name, fingerprint in entry.tool_fingerprints.items():
+                self._trusted_fp_index[fingerprint] = (entry.name, tool_name)
+                self._trusted_name_index.setdefault(tool_name.lower(), []).append(
+                    (entry.name, tool_name)
+                )
+        # BK-tree index for sublinear typosquat candidate lookup on large
+        # whitelists; small lists keep the plain scan.
+        self._max_name_len = max((len(l) for l, _ in self._lower_names), default=0)
+        self._bk_tree: Optional[_BKTree] = None
+        if len(self._lower_names) >= _BKTREE_MIN_ENTRIES:
+            tree = _BKTree()
+            for i, (lower, _) in enumerate(self._lower_names):
+                tree.add(lower, i)
+            self._bk_tree = tree
+        # Typosquat verdicts memoized per lowercase name; any whitelist
+        # change rebuilds the indexes and so empties the cache.
+        self._typosquat_cache: dict[str, Optional[str]] = {}
+        # Homoglyph-normalized approved name -> (lowercase, original) for
+        # the O(1) typosquat fast path; first entry wins on collision,
+        # mirroring the scan order.
+        self._normalized_approved: dict[str, tuple[str, str]] = {}
+        for lower, original in self._lower_names:
+            self._normalized_approved.setdefault(
+                lower.translate(_HOMOGLYPH_TABLE), (lower, original)
+            )
+        # Parallel (compiled pattern, entry) pairs so the URL scan walks a
+        # compact list of hot-path fields instead of dereferencing each
+        # dataclass; entries with no or invalid patterns drop out here.
+        self._url_patterns: list[tuple[re.Pattern, WhitelistEntry]] = []
+        seen_patterns: set[int] = set()
+        for entry in whitelist:
+            if not entry.url_pattern:
+                continue
+            pattern = entry._compiled_pattern
+            if pattern is None:
+                pattern = _pattern_cache.get(entry.url_pattern)
+                if pattern is None:
+                    try:
+                        pattern = re.compile(entry.url_pattern, re.IGNORECASE)
+                    except re.error:
+                        logger.warning(f"Invalid regex in whitelist: {entry.url_pattern}")
+                        continue
+                    _pattern_cache[entry.url_pattern] = pattern
+                entry._compiled_pattern = pattern
+            # Entries sharing a pattern are redundant in the scan: a miss
+            # misses for all of them and a hit returns the first one.
+            if id(pattern) in seen_patterns:
+                continue
+            seen_patterns.add(id(pattern))
+            self._url_patterns.append((pattern, entry))
+        # Fuse the patterns into one alternation so a lookup is a single
+        # regex dispatch instead of N sequential attempts. Alternatives
+        # keep whitelist order, and re tries them left to right, so the
+        # winning alternative is the entry the scan would have returned.
+        self._combined_url_re: Optional[re.Pattern] = None
+        if len(self._url_patterns) > 1 and not any(
+            _BACKREF_RE.search(pattern.pattern)
+            for pattern, _ in self._url_patterns
+        ):
+            try:
+                self._combined_url_re = re.compile(
+                    "|".join(
+                        f"(?P<e{i}>{pattern.pattern})"
+                        for i, (pattern, _) in enumerate(self._url_patterns)
+                    ),
+                    re.IGNORECASE,
+                )
+            except re.error:
+                # Conflicting group names or scoped inline flags cannot
+                # be fused; the sequential scan remains as fallback.
+                self._combined_url_re = None
 
     def evaluate_server_connection(
         self,
@@ -128,6 +412,24 @@ class ServerSpoofingGuard:
 
         return GuardDecision.allow()
 
+    async def evaluate_server_connections(
+        self,
+        contexts: list[GuardContext],
+    ) -> list[GuardDecision]:
+        """
+        Evaluate multiple server connections concurrently.
+
+        TLS health checks block for up to 5s per server; offloading each
+        evaluation to the default executor overlaps the handshakes so N
+        unknown servers cost roughly one timeout of wall time, not N.
+        Results are returned in the order of `contexts`.
+        """
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*[
+            loop.run_in_executor(None, self.evaluate_server_connection, context)
+            for context in contexts
+        ]))
+
     def evaluate_tools_list(
         self,
         tools: list[Tool],
@@ -142,15 +444,18 @@ class ServerSpoofingGuard:
         server_name = context.server_name
         warnings: list[str] = []
 
-        # Store tool fingerprints for this server
+        # Compute each tool's fingerprint once; mimicry detection and the
+        # registry update below share the result.
         tool_fingerprints = {}
+        fingerprints = []
         for tool in tools:
             fingerprint = self._compute_tool_fingerprint(tool)
             tool_fingerprints[tool.name] = fingerprint
+            fingerprints.append(fingerprint)
 
         # Check for tool mimicry
         if self.config.tool_mimicry_detection_enabled:
-            mimicry_result = self._detect_tool_mimicry(server_name, tools)
+            mimicry_result = self._detect_tool_mimicry(server_name, tools, fingerprints)
             if mimicry_result:
                 return GuardDecision.deny(
                     code="tool_mimicry_detected",
@@ -175,7 +480,10 @@ class ServerSpoofingGuard:
             )
 
         # Update registry with this server's tools
+        self._unregister_tools(server_name)
         self._tool_registry[server_name] = tool_fingerprints
+        for tool_name in tool_fingerprints:
+            self._tool_owners.setdefault(tool_name, []).append(server_name)
 
         if warnings:
             return GuardDecision.warn(warnings)
@@ -188,18 +496,24 @@ class ServerSpoofingGuard:
         server_url: Optional[str]
     ) -> Optional[WhitelistEntry]:
         """Find matching whitelist entry for a server."""
-        for entry in self.config.whitelist:
-            # Match by name
-            if entry.name.lower() == server_name.lower():
-                return entry
-
-            # Match by URL pattern
-            if server_url and entry.url_pattern:
-                try:
-                    if re.match(entry.url_pattern, server_url, re.IGNORECASE):
-                        return entry
-                except re.error:
-                    logger.warning(f"Invalid regex in whitelist: {entry.url_pattern}")
+        # Match by name
+        entry = self._by_name.get(server_name.lower())
+        if entry is not None:
+            return entry
+
+        # Match by URL pattern
+        if server_url:
+            combined = self._combined_url_re
+            if combined is not None:
+                match = combined.match(server_url)
+                if match is not None:
+                    for i, (_, entry) in enumerate(self._url_patterns):
+                        if match.group(f"e{i}") is not None:
+                            return entry
+                return None
+            for pattern, entry in self._url_patterns:
+                if pattern.match(server_url):
+                    return entry
 
         return None
 
@@ -210,84 +524,199 @@ class ServerSpoofingGuard:
         Uses Levenshtein distance to find similar names.
         """
         threshold = self.config.typosquat_similarity_threshold
+        test_name = server_name.lower()
+        if not test_name or not self._lower_names:
+            return None
+
+        # Memoized verdict: repeated connection attempts under the same
+        # name (the common case for a probing client) skip the scan. The
+        # cache is rebuilt empty whenever the whitelist changes.
+        cache = self._typosquat_cache
+        # Single atomic pop instead of check-then-pop: under the executor
+        # threads of evaluate_server_connections two lookups of the same
+        # name can race, and a lost race must mean a redundant re-scan,
+        # not a KeyError.
+        verdict = cache.pop(test_name, _CACHE_MISS)
+        if verdict is not _CACHE_MISS:
+            # Re-insert on hit so eviction drops the least recently used
+            cache[test_name] = verdict
+            return verdict
+
+        verdict = self._scan_typosquat(test_name, threshold)
+        if len(cache) >= _TYPOSQUAT_CACHE_MAX:
+            try:
+                cache.pop(next(iter(cache)), None)
+            except (StopIteration, RuntimeError):
+                # Another thread emptied or resized the dict between the
+                # length check and the step; the next insert re-evicts.
+                pass
+        cache[test_name] = verdict
+        return verdict
+
+    def _scan_typosquat(self, test_name: str, threshold: float) -> Optional[str]:
+        """Uncached typosquat scan over the whitelist for one name."""
+        # Exact whitelist members are by definition not typosquats; one
+        # hash lookup spares them the whole distance scan.
+        if test_name in self._by_name:
+            return None
+
+        # O(1) fast path: a homoglyph-stripped match against an approved
+        # name resolves without scanning the whitelist. The threshold and
+        # pattern checks still apply, so this only short-circuits hits the
+        # scan below would also flag.
+        candidate = self._normalized_approved.get(test_name.translate(_HOMOGLYPH_TABLE))
+        if candidate is not None:
+            approved_name, original_name = candidate
+            if (
+                approved_name != test_name
+                and levenshtein_ratio(approved_name, test_name) >= threshold
+                and self._is_typosquat_pattern(approved_name, test_name)
+            ):
+                return original_name
+
+        if self._bk_tree is not None:
+            # Any name passing the similarity threshold lies within this
+            # radius, so the tree query cannot drop true candidates.
+            radius = int(
+                (1.0 - threshold) * max(len(test_name), self._max_name_len)
+            )
+            candidates = [
+                self._lower_names[i]
+                for i in sorted(self._bk_tree.query(test_name, radius))
+            ]
+        else:
+            candidates = self._lower_names
 
-        for entry in self.config.whitelist:
-            approved_name = entry.name.lower()
-            test_name = server_name.lower()
+        for approved_name, original_name in candidates:
 
             # Skip exact matches
             if approved_name == test_name:
                 continue
 
-            # Calculate similarity
-            similarity = levenshtein_ratio(approved_name, test_name)
+            # O(1) lower bound: edit distance is at least the length gap,
+            # so skip entries whose gap alone exceeds the edit budget
+            # implied by the threshold.
+            max_dist = int((1.0 - threshold) * max(len(approved_name), len(test_name)))
+            if abs(len(approved_name) - len(test_name)) > max_dist:
+                continue
+
+            # Calculate similarity; the cutoff moves the threshold test
+            # into the native kernel, which stops early on clear misses
+            similarity = levenshtein_ratio(
+                approved_name, test_name, score_cutoff=threshold
+            )
 
             if similarity >= threshold:
                 # Additional heuristics for common typosquat patterns
                 if self._is_typosquat_pattern(approved_name, test_name):
-                    return entry.name
+                    return original_name
 
         return None
 
+    def detect_typosquats_batch(self, server_names: list[str]) -> list[Optional[str]]:
+        """
+        Typosquat-check a batch of server names in one call.
+
+        With rapidfuzz installed, the full names x whitelist similarity
+        matrix is computed by one multi-threaded C++ cdist kernel; the
+        Python loop then only inspects above-threshold cells. Falls back
+        to the per-name scan when rapidfuzz or numpy is unavailable.
+        Results are parallel to `server_names`.
+        """
+        if _rf_process is None or not self._lower_names:
+            return [self._detect_typosquat(name) for name in server_names]
+        try:
+            import numpy as np  # cdist materializes its result as ndarray
+        except ImportError:
+            return [self._detect_typosquat(name) for name in server_names]
+
+        queries = [name.lower() for name in server_names]
+        choices = [lower for lower, _ in self._lower_names]
+        threshold = self.config.typosquat_similarity_threshold
+        matrix = _rf_process.cdist(
+            queries,
+            choices,
+            scorer=_rf_normalized_similarity,
+            score_cutoff=threshold,
+            workers=-1,
+            dtype=np.float32,
+        )
+
+        results: list[Optional[str]] = []
+        for row, test_name in zip(matrix, queries):
+            match: Optional[str] = None
+            # Exact whitelist members are by definition not typosquats;
+            # mirrors the _scan_typosquat short-circuit so verdicts match
+            # the per-name fallback path.
+            if test_name in self._by_name:
+                results.append(match)
+                continue
+            for col in np.flatnonzero(row >= threshold):
+                approved_name, original_name = self._lower_names[col]
+                if approved_name != test_name and self._is_typosquat_pattern(
+                    approved_name, test_name
+                ):
+                    match = original_name
+                    break
+            results.append(match)
+        return results
+
     def _is_typosquat_pattern(self, approved: str, suspect: str) -> bool:
         """Check for common typosquat patterns."""
         # Check if difference is a single character substitution
         if len(approved) == len(suspect):
-            diffs = sum(1 for a, b in zip(approved, suspect) if a != b)
-            if diffs == 1:
+            if _count_diffs(approved, suspect) == 1:
                 return True
 
         # Check homoglyph attacks (visually similar characters)
-        homoglyphs = {
-            'o': ['0', 'ο'],  # Latin o, zero, Greek omicron
-            'l': ['1', 'I', '|'],
-            'i': ['1', 'l', '|'],
-            'a': ['@', 'α'],
-            'e': ['3', 'е'],  # Latin e, Cyrillic е
-        }
+        normalized_suspect = suspect.translate(_HOMOGLYPH_TABLE)
 
-        normalized_approved = approved
-        normalized_suspect = suspect
-        for char, substitutes in homoglyphs.items():
-            for sub in substitutes:
-                normalized_suspect = normalized_suspect.replace(sub, char)
-
-        if normalized_approved == normalized_suspect and approved != suspect:
+        if approved == normalized_suspect and approved != suspect:
             return True
 
         return False
 
     def _compute_tool_fingerprint(self, tool: Tool) -> str:
         """Compute a fingerprint for a tool based on its metadata."""
-        content = f"{tool.name}|{tool.description or ''}|{tool.input_schema}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        cached = getattr(tool, "_fingerprint", None)
+        if cached is not None:
+            return cached
+        # Feed the hasher directly instead of building an intermediate
+        # f-string (and its encoded copy) per tool. Byte stream and
+        # resulting digest are identical to the previous format.
+        h = _FINGERPRINT_HASHER.copy()
+        h.update(tool.name.encode())
+        h.update(b"|")
+        h.update((tool.description or "").encode())
+        h.update(b"|")
+        h.update(tool.input_schema.encode())
+        fingerprint = h.digest()[:8].hex()
+        tool._fingerprint = fingerprint
+        return fingerprint
 
     def _detect_tool_mimicry(
         self,
         server_name: str,
-        tools: list[Tool]
+        tools: list[Tool],
+        fingerprints: list[str],
     ) -> Optional[list[dict]]:
         """
         Detect if tools mimic trusted server tools.
 
-        Returns list of mimicked tools if detected, None otherwise.
+        `fingerprints` is parallel to `tools`, computed once by the
+        caller. Returns list of mimicked tools if detected, None otherwise.
         """
         mimicked = []
+        server_lower = server_name.lower()
 
-        # Get trusted tool fingerprints from whitelist
-        trusted_tools: dict[str, tuple[str, str]] = {}  # fingerprint -> (server_name, tool_name)
-        for entry in self.config.whitelist:
-            for tool_name, fingerprint in entry.tool_fingerprints.items():
-                trusted_tools[fingerprint] = (entry.name, tool_name)
-
-        # Compare incoming tools against trusted fingerprints
-        for tool in tools:
-            fingerprint = self._compute_tool_fingerprint(tool)
+        # Compare incoming tools against precomputed trusted indexes
+        for tool, fingerprint in zip(tools, fingerprints):
 
             # Check for exact fingerprint match from different server
-            if fingerprint in trusted_tools:
-                trusted_server, trusted_tool = trusted_tools[fingerprint]
-                if trusted_server.lower() != server_name.lower():
+            trusted = self._trusted_fp_index.get(fingerprint)
+            if trusted is not None:
+                trusted_server, trusted_tool = trusted
+                if trusted_server.lower() != server_lower:
                     mimicked.append({
                         "tool_name": tool.name,
                         "mimics_server": trusted_server,
@@ -296,19 +725,18 @@ class ServerSpoofingGuard:
                     })
 
             # Check for similar tool names with different implementations
-            for entry in self.config.whitelist:
-                if entry.name.lower() == server_name.lower():
+            for trusted_server, trusted_name in self._trusted_name_index.get(
+                tool.name.lower(), ()
+            ):
+                if trusted_server.lower() == server_lower:
                     continue
-
-                for trusted_name in entry.tool_fingerprints.keys():
-                    if tool.name.lower() == trusted_name.lower():
-                        # Same name, different server - potential mimicry
-                        mimicked.append({
-                            "tool_name": tool.name,
-                            "mimics_server": entry.name,
-                            "mimics_tool": trusted_name,
-                            "match_type": "name_collision",
-                        })
+                # Same name, different server - potential mimicry
+                mimicked.append({
+                    "tool_name": tool.name,
+                    "mimics_server": trusted_server,
+                    "mimics_tool": trusted_name,
+                    "match_type": "name_collision",
+                })
 
         return mimicked if mimicked else None
 
@@ -319,21 +747,36 @@ class ServerSpoofingGuard:
     ) -> Optional[list[dict]]:
         """Check for tool name collisions with other registered servers."""
         duplicates = []
+        server_lower = server_name.lower()
 
         for tool in tools:
-            for other_server, other_tools in self._tool_registry.items():
-                if other_server.lower() == server_name.lower():
+            for other_server in self._tool_owners.get(tool.name, ()):
+                if other_server.lower() == server_lower:
                     continue
-
-                if tool.name in other_tools:
-                    duplicates.append({
-                        "tool_name": tool.name,
-                        "this_server": server_name,
-                        "other_server": other_server,
-                    })
+                duplicates.append({
+                    "tool_name": tool.name,
+                    "this_server": server_name,
+                    "other_server": other_server,
+                })
 
         return duplicates if duplicates else None
 
+    def _unregister_tools(self, server_name: str) -> None:
+        """Drop a server's tools from the registry and the owner index."""
+        old_tools = self._tool_registry.pop(server_name, None)
+        if not old_tools:
+            return
+        for tool_name in old_tools:
+            owners = self._tool_owners.get(tool_name)
+            if owners is None:
+                continue
+            try:
+                owners.remove(server_name)
+            except ValueError:
+                pass
+            if not owners:
+                del self._tool_owners[tool_name]
+
     def _validate_server_health(
         self,
         server_url: str,
@@ -348,27 +791,24 @@ class ServerSpoofingGuard:
         - No exposed debug endpoints
         """
         warnings: list[str] = []
-        parsed = urlparse(server_url)
+        scheme, hostname, port = _parsed_url(server_url)
 
         # Check TLS requirement
         if self.config.require_valid_tls:
-            if parsed.scheme == "http":
+            if scheme == "http":
                 return GuardDecision.deny(
                     code="tls_required",
                     message=f"Server '{context.server_name}' does not use TLS (HTTPS required)",
                     details={
                         "server_url": server_url,
-                        "scheme": parsed.scheme,
+                        "scheme": scheme,
                         "requirement": "All MCP servers must use HTTPS",
                     }
                 )
 
             # Validate TLS certificate
-            if parsed.scheme == "https":
-                tls_valid, tls_error = self._check_tls_certificate(
-                    parsed.hostname or "",
-                    parsed.port or 443
-                )
+            if scheme == "https":
+                tls_valid, tls_error = self._check_tls_certificate(hostname, port)
                 if not tls_valid:
                     return GuardDecision.deny(
                         code="invalid_tls_certificate",
@@ -391,9 +831,15 @@ class ServerSpoofingGuard:
     ) -> tuple[bool, Optional[str]]:
         """Verify TLS certificate is valid."""
         try:
-            context = ssl.create_default_context()
+            context = self._ssl_context
             with socket.create_connection((hostname, port), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                with context.wrap_socket(
+                    sock,
+                    server_hostname=hostname,
+                    session=self._tls_sessions.get((hostname, port)),
+                ) as ssock:
+                    if ssock.session is not None:
+                        self._tls_sessions[(hostname, port)] = ssock.session
                     cert = ssock.getpeercert()
                     if cert:
                         return True, None
@@ -409,23 +855,23 @@ class ServerSpoofingGuard:
 
     def reset_server(self, server_name: str) -> None:
         """Reset state for a server (called on session re-initialization)."""
-        if server_name in self._tool_registry:
-            del self._tool_registry[server_name]
+        self._unregister_tools(server_name)
 
     def add_to_whitelist(self, entry: WhitelistEntry) -> None:
         """Add a server to the whitelist."""
-        # Remove existing entry with same name
-        self.config.whitelist = [
-            e for e in self.config.whitelist
-            if e.name.lower() != entry.name.lower()
-        ]
+        # Replace any existing entry with the same name via the index
+        # instead of filter-rebuilding the whole list.
+        old = self._by_name.get(entry.name.lower())
+        if old is not None:
+            self.config.whitelist.remove(old)
         self.config.whitelist.append(entry)
+        self._rebuild_indexes()
 
     def remove_from_whitelist(self, server_name: str) -> bool:
         """Remove a server from the whitelist."""
-        original_len = len(self.config.whitelist)
-        self.config.whitelist = [
-            e for e in self.config.whitelist
-            if e.name.lower() != server_name.lower()
-        ]
-        return len(self.config.whitelist) < original_len
+        old = self._by_name.get(server_name.lower())
+        if old is None:
+            return False
+        self.config.whitelist.remove(old)
+        self._rebuild_indexes()
+        return True
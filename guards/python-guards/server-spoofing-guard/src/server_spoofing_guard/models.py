@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 import json
+import re
 
 
 @dataclass
@@ -15,14 +16,29 @@ class Tool:
     """MCP Tool definition."""
     name: str
     description: Optional[str] = None
-    input_schema: str = "{}"  # JSON-serialized schema
+    input_schema: "str | dict" = "{}"  # JSON-serialized schema (or dict)
+
+    # Parsed schema, populated at most once
+    _parsed: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Accept an already-parsed dict and canonicalize it; string input
+        # is kept verbatim (fingerprints hash the raw schema string) and
+        # parsed lazily on first schema_dict() call.
+        if isinstance(self.input_schema, dict):
+            self._parsed = self.input_schema
+            self.input_schema = json.dumps(
+                self.input_schema, sort_keys=True, separators=(",", ":")
+            )
 
     def schema_dict(self) -> dict:
-        """Parse input_schema as dict."""
-        try:
-            return json.loads(self.input_schema)
-        except json.JSONDecodeError:
-            return {}
+        """Parse input_schema as dict (cached after the first call)."""
+        if self._parsed is None:
+            try:
+                self._parsed = json.loads(self.input_schema)
+            except json.JSONDecodeError:
+                self._parsed = {}
+        return self._parsed
 
 
 @dataclass
@@ -98,6 +114,12 @@ class WhitelistEntry:
     # Fingerprint for detecting tool mimicry
     tool_fingerprints: dict[str, str] = field(default_factory=dict)  # tool_name -> description_hash
 
+    # Compiled url_pattern, populated lazily on first match attempt so
+    # repeated lookups skip re's internal pattern cache
+    _compiled_pattern: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
 
 @dataclass
 class ServerConfig:
@@ -1,5 +1,7 @@
 """Tests for ServerSpoofingGuard."""
 
+import asyncio
+
 import pytest
 from server_spoofing_guard import (
     ServerSpoofingGuard,
@@ -48,6 +50,24 @@ class TestWhitelist:
         result = strict_guard.evaluate_server_connection(context)
         assert result.decision.value == "allow"
 
+    def test_url_pattern_with_backreference(self, strict_config: ServerConfig):
+        """Patterns using backreferences should still match after other entries."""
+        # Placed after other entries: fusing into one alternation would
+        # renumber \1 and silently break the match.
+        strict_config.whitelist.append(
+            WhitelistEntry(
+                name="mirror-tools",
+                url_pattern=r"(https)://mirror\.company\.com/\1/.*",
+            )
+        )
+        guard = ServerSpoofingGuard(config=strict_config)
+        context = GuardContext(
+            server_name="mirror-v2",
+            server_url="https://mirror.company.com/https/mcp",
+        )
+        result = guard.evaluate_server_connection(context)
+        assert result.decision.value == "allow"
+
 
 class TestTyposquatDetection:
     """Tests for typosquat detection."""
@@ -102,6 +122,136 @@ class TestTyposquatDetection:
         assert result.reason.code == "server_not_whitelisted"
 
 
+class TestConcurrentEvaluation:
+    """Tests for evaluate_server_connections."""
+
+    def test_results_match_sequential_in_order(
+        self, strict_guard: ServerSpoofingGuard
+    ):
+        """Concurrent evaluation should return sequential verdicts in input order."""
+        contexts = [
+            GuardContext(
+                server_name="finance-tools",
+                server_url="https://finance.company.com/mcp",
+            ),
+            GuardContext(
+                server_name="finance-toals",
+                server_url="https://evil.example.com/mcp",
+            ),
+            GuardContext(
+                server_name="unknown-server",
+                server_url="https://unknown.example.com/mcp",
+            ),
+            GuardContext(
+                server_name="hr-tools",
+                server_url="https://hr.company.com/mcp",
+            ),
+        ]
+        expected = [strict_guard.evaluate_server_connection(c) for c in contexts]
+        batch = asyncio.run(strict_guard.evaluate_server_connections(contexts))
+        assert len(batch) == len(contexts)
+        for got, want in zip(batch, expected):
+            assert got.decision == want.decision
+            got_code = got.reason.code if got.reason else None
+            want_code = want.reason.code if want.reason else None
+            assert got_code == want_code
+
+    def test_repeated_name_evaluated_concurrently(
+        self, strict_guard: ServerSpoofingGuard
+    ):
+        """Many concurrent evaluations of one name must all agree (cache race)."""
+        contexts = [
+            GuardContext(
+                server_name="finance-toals",
+                server_url="https://evil.example.com/mcp",
+            )
+        ] * 16
+        batch = asyncio.run(strict_guard.evaluate_server_connections(contexts))
+        assert all(result.decision.value == "deny" for result in batch)
+        assert all(
+            result.reason is not None
+            and result.reason.code == "typosquat_detected"
+            for result in batch
+        )
+
+
+class TestBKTreeIndex:
+    """Tests for the BK-tree typosquat index on large whitelists."""
+
+    @pytest.fixture
+    def large_whitelist(self) -> list[WhitelistEntry]:
+        """Whitelist large enough to activate the BK-tree index."""
+        return [
+            WhitelistEntry(
+                name=f"service-{i:02d}-tools",
+                url_pattern=rf"https://s{i:02d}\.company\.com/.*",
+            )
+            for i in range(40)
+        ]
+
+    def test_bktree_parity_with_linear_scan(
+        self, large_whitelist: list[WhitelistEntry], monkeypatch
+    ):
+        """Tree-pruned scans must return the same verdicts as the linear scan."""
+        import server_spoofing_guard.guard as guard_module
+
+        config = ServerConfig(
+            whitelist=large_whitelist,
+            typosquat_similarity_threshold=0.85,
+            health_validation_enabled=False,
+            require_valid_tls=False,
+        )
+        tree_guard = ServerSpoofingGuard(config=config)
+        assert tree_guard._bk_tree is not None
+
+        monkeypatch.setattr(guard_module, "_BKTREE_MIN_ENTRIES", 10_000)
+        linear_guard = ServerSpoofingGuard(config=config)
+        assert linear_guard._bk_tree is None
+
+        probes = []
+        for i in range(40):
+            probes.append(f"service-{i:02d}-toals")   # single substitution
+            probes.append(f"service-{i:02d}-too1s")   # homoglyph
+            probes.append(f"service-{i:02d}-tools")   # exact member
+            probes.append(f"svc-{i:02d}")             # unrelated
+        for probe in probes:
+            assert (
+                tree_guard._detect_typosquat(probe)
+                == linear_guard._detect_typosquat(probe)
+            ), probe
+
+
+class TestTyposquatBatch:
+    """Tests for batch typosquat detection."""
+
+    def test_batch_matches_per_name_verdicts(self, strict_guard: ServerSpoofingGuard):
+        """Batch results should agree with the per-name path, in input order."""
+        names = [
+            "finance-toals",            # single-char typosquat
+            "c0mpany-tools",            # homoglyph typosquat
+            "totally-different-server", # unrelated
+            "finance-tools",            # exact whitelist member
+        ]
+        batch = strict_guard.detect_typosquats_batch(names)
+        assert batch == [strict_guard._detect_typosquat(name) for name in names]
+        assert batch[0] == "finance-tools"
+        assert batch[2] is None
+
+    def test_batch_skips_exact_whitelist_members(self, strict_config: ServerConfig):
+        """A whitelisted name near another entry must not be flagged."""
+        # "finance-toolz" is one substitution from "finance-tools" but is
+        # itself whitelisted, so neither path may report it.
+        strict_config.whitelist.append(
+            WhitelistEntry(
+                name="finance-toolz",
+                url_pattern=r"https://toolz\.company\.com/.*",
+            )
+        )
+        guard = ServerSpoofingGuard(config=strict_config)
+        assert guard.detect_typosquats_batch(["finance-toolz"]) == [None]
+        assert guard._detect_typosquat("finance-toolz") is None
+
+
 class TestToolMimicry:
     """Tests for tool mimicry detection."""
 
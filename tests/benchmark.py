@@ -14,18 +14,33 @@ Environment Variables:
 """
 
 import argparse
+import array
 import asyncio
 import json
+import math
 import os
-import statistics
+import sys
 import time
-from collections import Counter
+
+import httpx
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from mcp_client import create_mcp_client, MCPClientBase
 
+try:
+    # Optional: vectorized metric aggregation for large runs
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    # Optional: C-level JSON for results files and --tool-args parsing
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 
 @dataclass
 class BenchmarkResult:
@@ -60,23 +75,43 @@ def calculate_percentile(data: List[float], percentile: float) -> float:
 
 
 def calculate_metrics(
-    latencies: List[float],
+    latencies_ns: "array.array",
     errors: List[str],
     total_duration: float
 ) -> BenchmarkResult:
-    """Calculate benchmark metrics from raw results."""
-    total = len(latencies) + len(errors)
-    successful = len(latencies)
+    """Calculate benchmark metrics from raw results (latencies in ns)."""
+    total = len(latencies_ns) + len(errors)
+    successful = len(latencies_ns)
     failed = len(errors)
 
-    # Convert to milliseconds and sort for percentile calculation
-    latencies_ms = sorted([lat * 1000 for lat in latencies])
-
-    if latencies_ms:
-        latency_min = min(latencies_ms)
-        latency_max = max(latencies_ms)
-        latency_avg = statistics.mean(latencies_ms)
-        latency_stddev = statistics.stdev(latencies_ms) if len(latencies_ms) > 1 else 0.0
+    if latencies_ns and _np is not None:
+        # One bulk ns->ms conversion, then a single C-level pass for all
+        # three quantiles.
+        arr = _np.asarray(latencies_ns, dtype=_np.float64)
+        arr /= 1e6
+        latency_min = float(arr.min())
+        latency_max = float(arr.max())
+        latency_avg = float(arr.mean())
+        latency_stddev = float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+        latency_p50, latency_p95, latency_p99 = (
+            float(p) for p in _np.percentile(arr, [50, 95, 99])
+        )
+    elif latencies_ns:
+        # Convert to milliseconds and sort once; min/max fall out of the
+        # sort and mean/variance fold into a single Welford pass.
+        latencies_ms = sorted(ns / 1e6 for ns in latencies_ns)
+        latency_min = latencies_ms[0]
+        latency_max = latencies_ms[-1]
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for x in latencies_ms:
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        latency_avg = mean
+        latency_stddev = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
         latency_p50 = calculate_percentile(latencies_ms, 50)
         latency_p95 = calculate_percentile(latencies_ms, 95)
         latency_p99 = calculate_percentile(latencies_ms, 99)
@@ -84,7 +119,10 @@ def calculate_metrics(
         latency_min = latency_max = latency_avg = latency_stddev = 0.0
         latency_p50 = latency_p95 = latency_p99 = 0.0
 
-    error_counts = dict(Counter(errors))
+    # Single pass, no intermediate Counter
+    error_counts: Dict[str, int] = {}
+    for e in errors:
+        error_counts[e] = error_counts.get(e, 0) + 1
     throughput = total / total_duration if total_duration > 0 else 0.0
 
     return BenchmarkResult(
@@ -127,9 +165,11 @@ async def execute_operation(
         if result.get("success"):
             return True, None
         else:
-            return False, result.get("error", "Unknown error")[:100]
+            # Failures repeat a handful of distinct messages; interning
+            # makes the error slots share one string object per kind
+            return False, sys.intern(result.get("error", "Unknown error")[:100])
     except Exception as e:
-        return False, f"{type(e).__name__}: {str(e)[:80]}"
+        return False, sys.intern(f"{type(e).__name__}: {str(e)[:80]}")
 
 
 async def run_benchmark(
@@ -144,53 +184,63 @@ async def run_benchmark(
     tool_args: Optional[Dict[str, Any]] = None
 ) -> BenchmarkResult:
     """Run benchmark with concurrent requests using pre-initialized client pool."""
-    latencies: List[float] = []
-    errors: List[str] = []
-    lock = asyncio.Lock()
-
     # Normalize route (ensure it starts with /)
     if not route.startswith("/"):
         route = "/" + route
 
+    # One shared httpx client backs the whole pool: one connection pool,
+    # DNS cache and set of keep-alive sockets instead of per-slot copies
+    http_client = httpx.AsyncClient(
+        timeout=60.0,
+        limits=httpx.Limits(max_connections=concurrency * 2),
+    )
+
     # Create a pool of pre-initialized clients (one per concurrency slot)
     # This eliminates connection setup overhead from measurements
     clients: List[MCPClientBase] = []
-    client_locks: List[asyncio.Lock] = []
 
     print(f"  Initializing {concurrency} client connections...")
     for i in range(concurrency):
-        client = create_mcp_client(gateway_url, route, transport)
+        client = create_mcp_client(gateway_url, route, transport, http_client=http_client)
         if operation != "initialize":
             init_result = await client.initialize(client_name=f"benchmark-pool-{i}")
             if not init_result.get("success"):
-                await client.close()
-                # Close already created clients
-                for c in clients:
-                    await c.close()
+                await http_client.aclose()
                 raise RuntimeError(f"Failed to initialize client {i}: {init_result.get('error')}")
         clients.append(client)
-        client_locks.append(asyncio.Lock())
+
+    # Free-client queue: any idle client picks up the next request, so
+    # one slow response stalls only its own client instead of every
+    # request that round-robin hashed onto it.
+    idle_clients: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(concurrency):
+        idle_clients.put_nowait(i)
 
     print(f"  Client pool ready.")
 
+    # Pre-sized result slots, one per request. Each task writes only its
+    # own index so recording is lock-free; integer nanoseconds avoid a
+    # float construction per request in the hot loop. array('q') packs
+    # them as contiguous 8-byte ints instead of boxed PyLongs.
+    latencies_ns = array.array("q", bytes(8 * num_requests))
+    request_errors: List[Optional[str]] = [None] * num_requests
+
     async def single_request(request_id: int, record: bool = True):
-        # Round-robin client selection
-        client_idx = request_id % concurrency
+        # Check out whichever client is free; exclusive checkout keeps
+        # each stateful MCP session single-user without per-client locks
+        client_idx = await idle_clients.get()
         client = clients[client_idx]
-        client_lock = client_locks[client_idx]
-
-        # Serialize access to each client (MCP sessions are stateful)
-        async with client_lock:
-            start = time.perf_counter()
+        try:
+            start = time.perf_counter_ns()
             success, error = await execute_operation(client, operation, tool_name, tool_args)
-            elapsed = time.perf_counter() - start
+            elapsed_ns = time.perf_counter_ns() - start
+        finally:
+            idle_clients.put_nowait(client_idx)
 
-            if record:
-                async with lock:
-                    if success:
-                        latencies.append(elapsed)
-                    else:
-                        errors.append(error or "Unknown error")
+        if record:
+            latencies_ns[request_id] = elapsed_ns
+            if not success:
+                request_errors[request_id] = error or "Unknown error"
 
     # Warmup phase - run requests without recording metrics
     if warmup_requests > 0:
@@ -202,12 +252,23 @@ async def run_benchmark(
     print(f"  Benchmarking: {num_requests} requests...")
     total_start = time.perf_counter()
     tasks = [single_request(i, record=True) for i in range(num_requests)]
-    await asyncio.gather(*tasks, return_exceptions=True)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
     total_duration = time.perf_counter() - total_start
 
-    # Cleanup client pool
-    for client in clients:
-        await client.close()
+    # Partition the slots after the timed section.
+    latencies = array.array("q")
+    errors: List[str] = []
+    for i, outcome in enumerate(results):
+        if isinstance(outcome, BaseException):
+            errors.append(f"{type(outcome).__name__}: {str(outcome)[:80]}")
+        elif request_errors[i] is not None:
+            errors.append(request_errors[i])
+        else:
+            latencies.append(latencies_ns[i])
+
+    # Cleanup: pooled clients share http_client, so closing it once
+    # tears down every connection
+    await http_client.aclose()
 
     return calculate_metrics(latencies, errors, total_duration)
 
@@ -299,8 +360,12 @@ def save_json(
         }
     }
 
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    if _orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(_orjson.dumps(output, option=_orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(output, f, indent=2)
 
     print(f"\nResults saved to: {output_path}")
 
@@ -385,8 +450,11 @@ Examples:
     tool_args = {}
     if args.tool_args:
         try:
-            tool_args = json.loads(args.tool_args)
-        except json.JSONDecodeError as e:
+            if _orjson is not None:
+                tool_args = _orjson.loads(args.tool_args)
+            else:
+                tool_args = json.loads(args.tool_args)
+        except (json.JSONDecodeError, ValueError) as e:
             print(f"Error: Invalid JSON for --tool-args: {e}")
             print(f"Received: {repr(args.tool_args)}")
             print("Tip: On Windows, use: --tool-args \"{\\\"key\\\": \\\"value\\\"}\"")
@@ -452,4 +520,11 @@ Examples:
 
 
 if __name__ == "__main__":
+    try:
+        # Optional: libuv event loop; lowers the benchmark's own
+        # per-request scheduling overhead
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     exit(asyncio.run(main()))
@@ -25,14 +25,25 @@ Routes tested (see configs/benchmark_guards.yaml):
 import argparse
 import asyncio
 import json
+import math
+import socket
+from array import array
 import os
 import sys
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+import httpx
+
 from mcp_client import create_mcp_client, MCPClientBase
 
+try:
+    # Optional: C-level stats aggregation for large -n runs
+    import numpy as _np
+except ImportError:
+    _np = None
+
 
 # ── Scenarios ────────────────────────────────────────────────────────────────
 
@@ -88,7 +99,9 @@ class LatencyStats:
     p50_ms: float = 0.0
     p95_ms: float = 0.0
     p99_ms: float = 0.0
-    count: int = 0       # total requests with measured latency (allowed + blocked)
+    stddev_ms: float = 0.0
+    cov: float = 0.0     # coefficient of variation (stddev / avg) — run noisiness
+    count: int = 0     # total requests with measured latency (allowed + blocked)
     allowed: int = 0     # guard allowed the request
     blocked: int = 0     # guard blocked (denied) the request — still measured
     errors: int = 0      # transport/connection errors — not measured
@@ -101,6 +114,8 @@ class LatencyStats:
             "p50_ms": round(self.p50_ms, 2),
             "p95_ms": round(self.p95_ms, 2),
             "p99_ms": round(self.p99_ms, 2),
+            "stddev_ms": round(self.stddev_ms, 2),
+            "cov": round(self.cov, 3),
             "count": self.count,
             "allowed": self.allowed,
             "blocked": self.blocked,
@@ -125,19 +140,48 @@ def percentile(data: List[float], pct: float) -> float:
 
 
 def compute_stats(
-    latencies_ms: List[float], allowed: int, blocked: int, errors: int
+    latencies_ns: "array", allowed: int, blocked: int, errors: int
 ) -> LatencyStats:
-    if not latencies_ms:
+    if not latencies_ns:
         return LatencyStats(errors=errors, count=0)
-    s = sorted(latencies_ms)
+    if _np is not None:
+        # np.percentile selects via introselect (O(n)), so the unsorted
+        # samples go straight in; sorting first would only add O(n log n)
+        arr = _np.asarray(latencies_ns, dtype=_np.float64)
+        arr /= 1e6
+        mn = float(arr.min())
+        mx = float(arr.max())
+        avg = float(arr.mean())
+        p50, p95, p99 = (float(p) for p in _np.percentile(arr, [50, 95, 99]))
+        std = float(arr.std(ddof=1)) if len(arr) > 1 else 0.0
+    else:
+        s = sorted(ns / 1e6 for ns in latencies_ns)
+        mn = s[0]
+        mx = s[-1]
+        avg = sum(s) / len(s)
+        p50 = percentile(s, 50)
+        p95 = percentile(s, 95)
+        p99 = percentile(s, 99)
+        # Welford's online update: single pass, numerically stable
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for x in s:
+            n += 1
+            d = x - mean
+            mean += d / n
+            m2 += d * (x - mean)
+        std = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
     return LatencyStats(
-        min_ms=s[0],
-        max_ms=s[-1],
-        avg_ms=sum(s) / len(s),
-        p50_ms=percentile(s, 50),
-        p95_ms=percentile(s, 95),
-        p99_ms=percentile(s, 99),
-        count=len(s),
+        min_ms=mn,
+        max_ms=mx,
+        avg_ms=avg,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        stddev_ms=std,
+        cov=std / avg if avg > 0 else 0.0,
+        count=len(latencies_ns),
         allowed=allowed,
         blocked=blocked,
         errors=errors,
@@ -146,6 +190,21 @@ def compute_stats(
 
 # ── Benchmark runner ─────────────────────────────────────────────────────────
 
+def _print_route_status(stats: LatencyStats):
+    """Print the one-line result summary for a route."""
+    if stats.count > 0:
+        status = f"{stats.allowed} ok"
+        if stats.blocked > 0:
+            status += f", {stats.blocked} blocked"
+        if stats.errors > 0:
+            status += f", {stats.errors} err"
+        print(f"avg={stats.avg_ms:7.1f}ms  sd={stats.stddev_ms:6.1f}ms  "
+              f"p50={stats.p50_ms:7.1f}ms  p95={stats.p95_ms:7.1f}ms  "
+              f"p99={stats.p99_ms:7.1f}ms  ({status})")
+    else:
+        print(f"FAILED ({stats.errors} errors)")
+
+
 async def bench_route(
     gateway_url: str,
     route: str,
@@ -154,9 +213,12 @@ async def bench_route(
     tool_args: Dict[str, Any],
     iterations: int,
     warmup: int,
+    concurrency: int = 1,
+    batch_size: int = 1,
+    http_client: Optional[httpx.AsyncClient] = None,
 ) -> LatencyStats:
     """Run a single benchmark scenario against a single route."""
-    client = create_mcp_client(gateway_url, route, transport)
+    client = create_mcp_client(gateway_url, route, transport, http_client=http_client)
 
     # Initialize MCP session
     try:
@@ -168,13 +230,14 @@ async def bench_route(
         await client.close()
         return LatencyStats(errors=iterations, count=0)
 
-    latencies: List[float] = []
+    # Packed integer nanoseconds: no PyFloat allocation per iteration,
+    # contiguous 8-byte storage for the stats pass
+    latencies = array("q")
     allowed = 0
     blocked = 0
     errors = 0
 
-    # Warmup
-    for _ in range(warmup):
+    async def prewarm_call():
         try:
             if tool_name is None:
                 await client.list_tools()
@@ -183,25 +246,89 @@ async def bench_route(
         except Exception:
             pass
 
-    # Measured iterations
-    for _ in range(iterations):
-        start = time.perf_counter()
-        try:
-            if tool_name is None:
-                result = await client.list_tools()
-            else:
-                result = await client.call_tool(tool_name, tool_args)
-            elapsed_ms = (time.perf_counter() - start) * 1000.0
-
+    # Prewarm: a first list_tools makes the gateway compile and cache the
+    # route's guard modules, then the warmup calls land in parallel so
+    # keep-alive sockets are open before timing starts. Cold-start costs
+    # (TLS, WASM compile, upstream session bootstrap) otherwise show up
+    # as fake p95/p99 outliers. Results are discarded.
+    try:
+        await client.list_tools()
+    except Exception:
+        pass
+    if warmup > 0:
+        await asyncio.gather(*[prewarm_call() for _ in range(warmup)])
+
+    # Measured iterations: up to `concurrency` requests in flight at
+    # once behind a semaphore; concurrency=1 reproduces the old serial
+    # closed loop exactly.
+    sem = asyncio.Semaphore(concurrency)
+
+    # Bind hot names once outside the tasks: attribute lookups inside
+    # the timed span otherwise repeat per iteration, and the tool_name
+    # branch resolves here instead of per request.
+    _perf_ns = time.perf_counter_ns
+    _call_batch = client.call_tool_batch
+    if tool_name is None:
+        _invoke = client.list_tools
+    else:
+        _call_tool = client.call_tool
+
+        def _invoke():
+            return _call_tool(tool_name, tool_args)
+
+    async def one() -> Tuple[int, Optional[bool]]:
+        async with sem:
+            start = _perf_ns()
+            try:
+                result = await _invoke()
+                elapsed_ns = _perf_ns() - start
+                return elapsed_ns, bool(result.get("success"))
+            except Exception:
+                return 0, None
+
+    async def one_batch(n: int) -> Tuple[int, Optional[List[bool]]]:
+        async with sem:
+            start = _perf_ns()
+            try:
+                batch_results = await _call_batch([(tool_name, tool_args)] * n)
+                elapsed_ns = _perf_ns() - start
+                return elapsed_ns, [bool(r.get("success")) for r in batch_results]
+            except Exception:
+                return 0, None
+
+    if batch_size > 1 and tool_name is not None:
+        # Batched mode: each POST carries batch_size calls, so the
+        # recorded per-call latency is the batch round-trip divided by
+        # the batch size (an amortized mean, not a true per-call sample).
+        sizes = [
+            min(batch_size, iterations - i)
+            for i in range(0, iterations, batch_size)
+        ]
+        outcomes = await asyncio.gather(*[one_batch(n) for n in sizes])
+        for (elapsed_ns, oks), n in zip(outcomes, sizes):
+            if oks is None:
+                errors += n
+                continue
+            per_call_ns = elapsed_ns // n
+            for ok in oks:
+                latencies.append(per_call_ns)
+                if ok:
+                    allowed += 1
+                else:
+                    blocked += 1
+    else:
+        outcomes = await asyncio.gather(*[one() for _ in range(iterations)])
+        for elapsed_ns, ok in outcomes:
+            if ok is None:
+                errors += 1
+                continue
             # Record latency for both allowed and blocked requests —
             # the guard still ran either way, and that's what we measure.
-            latencies.append(elapsed_ms)
-            if result.get("success"):
+            latencies.append(elapsed_ns)
+            if ok:
                 allowed += 1
             else:
                 blocked += 1
-        except Exception:
-            errors += 1
 
     await client.close()
     return compute_stats(latencies, allowed, blocked, errors)
@@ -214,10 +341,57 @@ async def run_all(
     warmup: int,
     routes: Dict[str, str],
     scenarios: List[Dict[str, Any]],
+    concurrency: int = 1,
+    batch_size: int = 1,
+    parallel_routes: bool = False,
+    stream_file=None,
+    http2: bool = False,
 ) -> List[ScenarioResult]:
-    """Run all scenarios across all routes."""
+    """Run all scenarios across all routes.
+
+    When `stream_file` is given, each scenario is appended to it as one
+    JSON line the moment it completes, so long runs surface partial
+    results even if a later scenario crashes the process.
+    """
     results: List[ScenarioResult] = []
 
+    # One keep-alive connection pool for the entire run: every scenario x
+    # route reuses warm sockets instead of paying TCP/TLS setup per
+    # bench_route, so guard-overhead numbers aren't polluted by
+    # connection noise.
+    limits = httpx.Limits(
+        max_keepalive_connections=32,
+        max_connections=64,
+        keepalive_expiry=60.0,
+    )
+
+    def make_client(use_http2: bool) -> httpx.AsyncClient:
+        # TCP_NODELAY: small MCP frames (initialize, tools/list) must not
+        # sit in Nagle's buffer waiting for a delayed ACK, or the bench
+        # reads ~40ms stack artifacts as guard overhead. Older httpx
+        # without socket_options just skips it.
+        try:
+            transport = httpx.AsyncHTTPTransport(
+                http2=use_http2,
+                limits=limits,
+                socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+            )
+            return httpx.AsyncClient(timeout=60.0, transport=transport)
+        except TypeError:
+            return httpx.AsyncClient(timeout=60.0, limits=limits, http2=use_http2)
+
+    if http2:
+        try:
+            # Multiplexes concurrent in-flight requests over one TLS
+            # connection instead of one socket each
+            http_client = make_client(True)
+        except ImportError:
+            print("  http2 requested but the 'h2' package is not installed; "
+                  "falling back to HTTP/1.1")
+            http_client = make_client(False)
+    else:
+        http_client = make_client(False)
+
     for scenario in scenarios:
         name = scenario["name"]
         desc = scenario["description"]
@@ -227,11 +401,8 @@ async def run_all(
         print(f"\n--- Scenario: {desc} ---")
         sr = ScenarioResult(scenario=name, description=desc)
 
-        for label, route in routes.items():
-            sys.stdout.write(f"  {label:15s} ... ")
-            sys.stdout.flush()
-
-            stats = await bench_route(
+        def route_coro(route: str):
+            return bench_route(
                 gateway_url=gateway_url,
                 route=route,
                 transport=transport,
@@ -239,23 +410,40 @@ async def run_all(
                 tool_args=args,
                 iterations=iterations,
                 warmup=warmup,
+                concurrency=concurrency,
+                batch_size=batch_size,
+                http_client=http_client,
             )
-            sr.route_results[label] = stats
-
-            if stats.count > 0:
-                status = f"{stats.allowed} ok"
-                if stats.blocked > 0:
-                    status += f", {stats.blocked} blocked"
-                if stats.errors > 0:
-                    status += f", {stats.errors} err"
-                print(f"avg={stats.avg_ms:7.1f}ms  p50={stats.p50_ms:7.1f}ms  "
-                      f"p95={stats.p95_ms:7.1f}ms  p99={stats.p99_ms:7.1f}ms  "
-                      f"({status})")
-            else:
-                print(f"FAILED ({stats.errors} errors)")
+
+        if parallel_routes:
+            # All routes at once: faster wallclock, but numbers reflect
+            # the gateway under mixed load rather than isolated routes.
+            all_stats = await asyncio.gather(
+                *[route_coro(route) for route in routes.values()]
+            )
+            for label, stats in zip(routes.keys(), all_stats):
+                sr.route_results[label] = stats
+                sys.stdout.write(f"  {label:15s} ... ")
+                _print_route_status(stats)
+        else:
+            for label, route in routes.items():
+                sys.stdout.write(f"  {label:15s} ... ")
+                sys.stdout.flush()
+                stats = await route_coro(route)
+                sr.route_results[label] = stats
+                _print_route_status(stats)
 
         results.append(sr)
 
+        if stream_file is not None:
+            stream_file.write(json.dumps({
+                "scenario": sr.scenario,
+                "description": sr.description,
+                "routes": {k: v.to_dict() for k, v in sr.route_results.items()},
+            }) + "\n")
+            stream_file.flush()
+
+    await http_client.aclose()
     return results
 
 
@@ -263,20 +451,23 @@ async def run_all(
 
 def print_comparison(results: List[ScenarioResult]):
     """Print a summary comparison table."""
-    print("\n" + "=" * 90)
-    print("GUARD BENCHMARK COMPARISON")
-    print("=" * 90)
+    # Build the whole table first, emit it in one write: one stdout
+    # flush instead of a syscall per row, and the rows stay together
+    # even when other tasks are printing.
+    lines = ["", "=" * 90, "GUARD BENCHMARK COMPARISON", "=" * 90]
 
     for sr in results:
         baseline = sr.route_results.get("baseline")
         if not baseline or baseline.count == 0:
-            print(f"\n  {sr.description}: baseline unavailable, skipping comparison")
+            lines.append(f"\n  {sr.description}: baseline unavailable, skipping comparison")
             continue
 
-        print(f"\n  {sr.description}")
-        print(f"  {'Route':<15s}  {'Avg (ms)':>10s}  {'P50 (ms)':>10s}  {'P95 (ms)':>10s}  "
-              f"{'P99 (ms)':>10s}  {'Overhead':>12s}  {'OK':>4s}  {'Blk':>4s}")
-        print(f"  {'-'*15}  {'-'*10}  {'-'*10}  {'-'*10}  {'-'*10}  {'-'*12}  {'-'*4}  {'-'*4}")
+        lines.append(f"\n  {sr.description}")
+        lines.append(
+            f"  {'Route':<15s}  {'Avg (ms)':>10s}  {'P50 (ms)':>10s}  {'P95 (ms)':>10s}  "
+            f"{'P99 (ms)':>10s}  {'Overhead':>12s}  {'OK':>4s}  {'Blk':>4s}")
+        lines.append(
+            f"  {'-'*15}  {'-'*10}  {'-'*10}  {'-'*10}  {'-'*10}  {'-'*12}  {'-'*4}  {'-'*4}")
 
         for label in ["baseline", "pii_guard", "wasm_pi", "both_guards"]:
             stats = sr.route_results.get(label)
@@ -290,11 +481,13 @@ def print_comparison(results: List[ScenarioResult]):
                 pct = (diff / baseline.avg_ms) * 100 if baseline.avg_ms > 0 else 0
                 overhead = f"+{diff:.1f} ({pct:+.0f}%)"
 
-            print(f"  {label:<15s}  {stats.avg_ms:10.1f}  {stats.p50_ms:10.1f}  "
-                  f"{stats.p95_ms:10.1f}  {stats.p99_ms:10.1f}  {overhead:>12s}  "
-                  f"{stats.allowed:4d}  {stats.blocked:4d}")
+            lines.append(
+                f"  {label:<15s}  {stats.avg_ms:10.1f}  {stats.p50_ms:10.1f}  "
+                f"{stats.p95_ms:10.1f}  {stats.p99_ms:10.1f}  {overhead:>12s}  "
+                f"{stats.allowed:4d}  {stats.blocked:4d}")
 
-    print("\n" + "=" * 90)
+    lines.extend(["", "=" * 90])
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def save_results(results: List[ScenarioResult], output_path: str):
@@ -338,6 +531,12 @@ Examples:
         default=50,
         help="Requests per scenario per route (default: 50)",
     )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=1,
+        help="Concurrent in-flight requests per route (default: 1, serial)",
+    )
     parser.add_argument(
         "-w", "--warmup",
         type=int,
@@ -357,7 +556,27 @@ Examples:
     )
     parser.add_argument(
         "-o", "--output",
-        help="Save results to JSON file",
+        help="Save results to JSON file (a .jsonl path streams one line "
+             "per scenario as it completes)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="JSON-RPC calls per HTTP request (default: 1; >1 amortizes "
+             "round-trips but reports per-call latency as the batch mean)",
+    )
+    parser.add_argument(
+        "--http-version",
+        choices=["1.1", "2"],
+        default="1.1",
+        help="HTTP version for the shared pool (default: 1.1; SSE streaming "
+             "is only well-tested over 1.1, and 2 requires the h2 package)",
+    )
+    parser.add_argument(
+        "--parallel-routes",
+        action="store_true",
+        help="Benchmark all routes of a scenario concurrently (mixed-load numbers)",
     )
     parser.add_argument(
         "--routes",
@@ -383,24 +602,48 @@ Examples:
     print(f"Gateway:     {args.gateway}")
     print(f"Transport:   {args.transport}")
     print(f"Iterations:  {args.iterations}")
+    print(f"Concurrency: {args.concurrency}")
     print(f"Warmup:      {args.warmup}")
     print(f"Routes:      {', '.join(routes.keys())}")
     print(f"Scenarios:   {', '.join(s['name'] for s in scenarios)}")
 
-    results = await run_all(
-        gateway_url=args.gateway,
-        transport=args.transport,
-        iterations=args.iterations,
-        warmup=args.warmup,
-        routes=routes,
-        scenarios=scenarios,
-    )
+    stream_file = None
+    if args.output and args.output.endswith(".jsonl"):
+        stream_file = open(args.output, "w")
+
+    try:
+        results = await run_all(
+            gateway_url=args.gateway,
+            transport=args.transport,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            routes=routes,
+            scenarios=scenarios,
+            concurrency=args.concurrency,
+            parallel_routes=args.parallel_routes,
+            stream_file=stream_file,
+            http2=args.http_version == "2",
+        )
+    finally:
+        if stream_file is not None:
+            stream_file.close()
+            print(f"\nResults streamed to {args.output}")
 
     print_comparison(results)
 
-    if args.output:
-        save_results(results, args.output)
+    if args.output and stream_file is None:
+        # Serialization and file I/O off the loop thread; irrelevant for
+        # small runs but keeps a large pretty-printed dump from stalling
+        # any still-pending loop callbacks
+        await asyncio.to_thread(save_results, results, args.output)
 
 
 if __name__ == "__main__":
+    try:
+        # Optional: libuv loop; noticeably cheaper per request for a
+        # keep-alive httpx workload
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
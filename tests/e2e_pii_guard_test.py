@@ -35,8 +35,11 @@ import asyncio
 import os
 import re
 import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+import httpx
+
 from mcp_client import create_mcp_client, TestResults
 
 # Route defaults per mode
@@ -54,6 +57,11 @@ MASK_PLACEHOLDERS = {
     "url": "<URL>",
 }
 
+# All mask placeholders as one alternation, compiled once at import, so a
+# single linear scan finds every masked entity type instead of one substring
+# search per placeholder.
+_ANY_MASK_RE = re.compile("|".join(re.escape(ph) for ph in MASK_PLACEHOLDERS.values()))
+
 # Patterns indicating raw (unredacted) PII still present in response
 RAW_PII_PATTERNS = {
     "email": re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'),
@@ -78,11 +86,79 @@ PII_TYPES_UNDER_TEST = {
 }
 
 
+# Shared connection state, reused across every mode run in the process so
+# TCP/TLS setup is paid once rather than per test_pii_guard invocation.
+_shared_http_client: httpx.AsyncClient | None = None
+_mcp_client_cache: dict = {}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        )
+    return _shared_http_client
+
+
+@asynccontextmanager
+async def shared_client(gateway_url: str, route: str, transport: str = "streamable"):
+    """Yield an MCP client backed by the shared httpx connection pool.
+
+    Clients are cached per (url, route, transport), so a repeat run against
+    the same route reuses the existing MCP session instead of re-creating
+    the client. Call close_shared_clients() once the suite is done.
+    """
+    key = (gateway_url, route, transport)
+    client = _mcp_client_cache.get(key)
+    if client is None:
+        client = create_mcp_client(
+            gateway_url, route=route, transport=transport,
+            http_client=_get_http_client(),
+        )
+        _mcp_client_cache[key] = client
+    yield client
+
+
+async def close_shared_clients():
+    """Tear down the shared connection pool and cached MCP clients."""
+    global _shared_http_client
+    _mcp_client_cache.clear()
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+
+async def _gather_named(coros: dict) -> dict:
+    """Run independent coroutines concurrently, returning {key: result}.
+
+    Uses asyncio.TaskGroup when available (3.11+) for structured
+    cancellation; falls back to asyncio.gather on older runtimes.
+    """
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as tg:
+            tasks = {key: tg.create_task(coro) for key, coro in coros.items()}
+        return {key: task.result() for key, task in tasks.items()}
+    values = await asyncio.gather(*coros.values())
+    return dict(zip(coros.keys(), values))
+
+
 def _has_mask_placeholder(content: str, pii_type: str) -> bool:
     """Check if content contains the expected mask placeholder for a PII type."""
     return MASK_PLACEHOLDERS[pii_type] in content
 
 
+def _masked_types(content: str) -> list:
+    """Return PII types whose mask placeholder appears in content.
+
+    One pass over the content via the combined alternation, regardless of
+    how many placeholder types are being checked.
+    """
+    found = set(_ANY_MASK_RE.findall(content))
+    return [pt for pt, ph in MASK_PLACEHOLDERS.items() if ph in found]
+
+
 def _has_raw_pii(content: str, pii_type: str) -> bool:
     """Check if content contains raw (unredacted) PII of the given type."""
     pattern = RAW_PII_PATTERNS.get(pii_type)
@@ -150,8 +226,9 @@ def assess_pii_response(
         # Check for cross-type masking: PII was caught but by a different recognizer
         # (e.g. SSN masked as <PHONE_NUMBER> due to recognizer overlap)
         other_placeholders = {
-            pt: ph for pt, ph in MASK_PLACEHOLDERS.items()
-            if pt != pii_type and ph in content
+            pt: MASK_PLACEHOLDERS[pt]
+            for pt in _masked_types(content)
+            if pt != pii_type
         }
         if other_placeholders:
             actual = ", ".join(f"{ph} ({pt})" for pt, ph in other_placeholders.items())
@@ -215,7 +292,7 @@ async def test_pii_guard(
     print(f"Transport: {transport}")
     print(f"Expected mode: {expect_mode}\n")
 
-    async with create_mcp_client(gateway_url, route=route, transport=transport) as client:
+    async with shared_client(gateway_url, route, transport=transport) as client:
 
         # -- Test 1: Basic Connectivity --
         print("[Test 1: MCP Endpoint Connectivity]")
@@ -267,16 +344,20 @@ async def test_pii_guard(
             )
 
         # -- Tests 4-9: Single PII type detection via generate_pii --
+        # The six calls are independent, so dispatch them concurrently and
+        # assess the results in test order once all have returned. Wall time
+        # collapses to roughly the slowest round-trip instead of the sum.
         detected_mode = None
 
+        single_results = await _gather_named({
+            pii_type: client.call_tool("generate_pii", {"pii_type": pii_type})
+            for pii_type in PII_TYPES_UNDER_TEST
+        })
+
         for i, (pii_type, label) in enumerate(PII_TYPES_UNDER_TEST.items(), start=4):
             print(f"\n[Test {i}: Generate {label} PII]")
-            result = await client.call_tool(
-                "generate_pii",
-                {"pii_type": pii_type}
-            )
             mode = assess_pii_response(
-                result, pii_type, results,
+                single_results[pii_type], pii_type, results,
                 f"{label} PII detection", expect_mode,
             )
             if mode in ("masked", "rejected") and detected_mode is None:
@@ -285,27 +366,41 @@ async def test_pii_guard(
         if detected_mode:
             print(f"\n    Detected guard mode: {detected_mode}")
 
-        # -- Tests 10-15: Embedded PII in natural language text --
+        # -- Tests 10-19: embedded text, full record, bulk, and clean data --
+        # Also mutually independent; run as a second concurrent batch.
         all_embedded_types = ["email", "ssn", "credit_card", "phone", "ca_sin", "url"]
 
+        batch_results = await _gather_named({
+            **{
+                f"text:{pii_type}": client.call_tool(
+                    "generate_text_with_pii", {"pii_type": pii_type}
+                )
+                for pii_type in all_embedded_types
+            },
+            "full": client.call_tool("generate_full_record", {}),
+            "bulk_email": client.call_tool(
+                "generate_bulk_pii", {"pii_type": "email", "count": 5}
+            ),
+            "bulk_cc": client.call_tool(
+                "generate_bulk_pii", {"pii_type": "credit_card", "count": 3}
+            ),
+            "clean": client.call_tool("generate_pii", {"pii_type": "name"}),
+        })
+
         for i, pii_type in enumerate(all_embedded_types, start=10):
             label = PII_TYPES_UNDER_TEST[pii_type]
             print(f"\n[Test {i}: Embedded {label} in Text]")
-            result = await client.call_tool(
-                "generate_text_with_pii",
-                {"pii_type": pii_type}
-            )
             assess_pii_response(
-                result, pii_type, results,
+                batch_results[f"text:{pii_type}"], pii_type, results,
                 f"Embedded {label} detection", expect_mode,
             )
 
         # -- Test 16: Full record (multiple PII types simultaneously) --
         print("\n[Test 16: Full Record with Multiple PII Types]")
-        full_result = await client.call_tool("generate_full_record", {})
+        full_result = batch_results["full"]
         if full_result["success"]:
             content = full_result.get("result", {}).get("content", [{}])[0].get("text", "")
-            masked_types = [pt for pt, ph in MASK_PLACEHOLDERS.items() if ph in content]
+            masked_types = _masked_types(content)
             raw_types = [
                 pt for pt in ["email", "phone", "ssn", "credit_card"]
                 if _has_raw_pii(content, pt)
@@ -352,10 +447,7 @@ async def test_pii_guard(
 
         # -- Test 17: Bulk PII generation (email) --
         print("\n[Test 17: Bulk PII Generation (email)]")
-        bulk_result = await client.call_tool(
-            "generate_bulk_pii",
-            {"pii_type": "email", "count": 5}
-        )
+        bulk_result = batch_results["bulk_email"]
         if bulk_result["success"]:
             content = bulk_result.get("result", {}).get("content", [{}])[0].get("text", "")
             placeholder = MASK_PLACEHOLDERS["email"]
@@ -401,10 +493,7 @@ async def test_pii_guard(
 
         # -- Test 18: Bulk PII generation (credit_card) --
         print("\n[Test 18: Bulk PII Generation (credit_card)]")
-        bulk_cc_result = await client.call_tool(
-            "generate_bulk_pii",
-            {"pii_type": "credit_card", "count": 3}
-        )
+        bulk_cc_result = batch_results["bulk_cc"]
         if bulk_cc_result["success"]:
             content = bulk_cc_result.get("result", {}).get("content", [{}])[0].get("text", "")
             placeholder = MASK_PLACEHOLDERS["credit_card"]
@@ -450,13 +539,10 @@ async def test_pii_guard(
 
         # -- Test 19: Clean data (no PII - name only) --
         print("\n[Test 19: Clean Data - No PII Expected]")
-        clean_result = await client.call_tool(
-            "generate_pii",
-            {"pii_type": "name"}
-        )
+        clean_result = batch_results["clean"]
         if clean_result["success"]:
             content = clean_result.get("result", {}).get("content", [{}])[0].get("text", "")
-            any_mask = any(ph in content for ph in MASK_PLACEHOLDERS.values())
+            any_mask = bool(_ANY_MASK_RE.search(content))
             if any_mask:
                 results.add_warning(
                     "Name data triggered PII detection (may be false positive)"
@@ -503,34 +589,37 @@ async def run_tests(
 
     results = TestResults()
 
-    if expect_mode == "both":
-        # Run mask tests then reject tests sequentially
-        for mode, default_route in [("mask", ROUTE_MASK), ("reject", ROUTE_REJECT)]:
+    try:
+        if expect_mode == "both":
+            # Run mask tests then reject tests sequentially
+            for mode, default_route in [("mask", ROUTE_MASK), ("reject", ROUTE_REJECT)]:
+                try:
+                    await test_pii_guard(
+                        gateway_url, default_route, results,
+                        transport=transport, expect_mode=mode,
+                    )
+                except Exception as e:
+                    results.add_fail(f"Test execution ({mode} mode)", str(e))
+                    import traceback
+                    print(f"\nException details:\n{traceback.format_exc()}")
+        else:
+            # Single mode run
+            if route is None:
+                if expect_mode == "reject":
+                    route = ROUTE_REJECT
+                else:
+                    route = ROUTE_MASK
             try:
                 await test_pii_guard(
-                    gateway_url, default_route, results,
-                    transport=transport, expect_mode=mode,
+                    gateway_url, route, results,
+                    transport=transport, expect_mode=expect_mode,
                 )
             except Exception as e:
-                results.add_fail(f"Test execution ({mode} mode)", str(e))
+                results.add_fail("Test execution", str(e))
                 import traceback
                 print(f"\nException details:\n{traceback.format_exc()}")
-    else:
-        # Single mode run
-        if route is None:
-            if expect_mode == "reject":
-                route = ROUTE_REJECT
-            else:
-                route = ROUTE_MASK
-        try:
-            await test_pii_guard(
-                gateway_url, route, results,
-                transport=transport, expect_mode=expect_mode,
-            )
-        except Exception as e:
-            results.add_fail("Test execution", str(e))
-            import traceback
-            print(f"\nException details:\n{traceback.format_exc()}")
+    finally:
+        await close_shared_clients()
 
     print(f"\nCompleted: {datetime.now().isoformat()}")
     results.print_summary()
@@ -17,29 +17,85 @@ Usage:
 import json
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     import httpx
 except ImportError:
     raise ImportError("Required package not installed. Install with: pip install httpx")
 
+try:
+    # Optional: C-level JSON codec; orjson.JSONDecodeError subclasses
+    # json.JSONDecodeError so the existing handlers keep working
+    import orjson as _orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return _orjson.dumps(obj)
+
+    _json_loads = _orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+
+def _find_sse_frame(text: str) -> Optional[Dict[str, Any]]:
+    """Extract the first decodable JSON-RPC message from SSE text.
+
+    A find()-driven scan over the raw string: no per-line list from
+    split(), no startswith() call per line, and it stops at the first
+    frame that decodes.
+    """
+    pos = 0
+    while True:
+        if text.startswith('data: ', pos):
+            start = pos + 6
+        else:
+            idx = text.find('\ndata: ', pos)
+            if idx == -1:
+                return None
+            start = idx + 7
+        end = text.find('\n', start)
+        if end == -1:
+            end = len(text)
+        try:
+            return _json_loads(text[start:end])
+        except json.JSONDecodeError:
+            pos = end
+
 
 class MCPClientBase(ABC):
     """Base class for MCP clients with different transport protocols."""
 
-    def __init__(self, base_url: str, route: str):
+    def __init__(self, base_url: str, route: str,
+                 http_client: Optional[httpx.AsyncClient] = None):
         """
         Args:
             base_url: Gateway base URL (e.g., http://localhost:8080)
             route: Route path (e.g., "poison", "rug-pull", "pii-test")
+            http_client: Optional shared httpx.AsyncClient. Lets many MCP
+                clients reuse one connection pool (sockets, TLS handshakes,
+                DNS cache); the caller owns its lifetime and close() will
+                not touch it.
         """
         self.base_url = base_url.rstrip('/')
         self.route = route.lstrip('/')
         self.session_id = str(uuid.uuid4())
         self.session_header = None
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(timeout=60.0)
         self.message_id = 0
+        # Reusable JSON-RPC templates: each call rewrites id/params and
+        # serializes immediately, so per-request dict construction drops
+        # to a few item assignments.
+        self._list_template = {
+            "jsonrpc": "2.0", "id": 0, "method": "tools/list", "params": {}
+        }
+        self._call_template = {
+            "jsonrpc": "2.0", "id": 0, "method": "tools/call",
+            "params": {"name": None, "arguments": None},
+        }
 
     async def __aenter__(self):
         return self
@@ -48,7 +104,8 @@ class MCPClientBase(ABC):
         await self.close()
 
     async def close(self):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
 
     def _next_message_id(self) -> int:
         self.message_id += 1
@@ -63,6 +120,19 @@ class MCPClientBase(ABC):
         """Get the Accept header for this transport."""
         pass
 
+    async def _post_message(
+        self, url: str, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[int, Any, Optional[Dict[str, Any]], str]:
+        """POST a JSON-RPC message and parse the reply.
+
+        Returns (status_code, response_headers, parsed message or None,
+        raw body text for error reporting). Transports may override to
+        avoid materializing the full response body.
+        """
+        response = await self.client.post(url, content=body, headers=headers)
+        data = self._parse_response(response.text) if response.status_code == 200 else None
+        return response.status_code, response.headers, data, response.text
+
     @abstractmethod
     def _parse_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """Parse the response and extract JSON-RPC message."""
@@ -95,19 +165,18 @@ class MCPClientBase(ABC):
         }
 
         try:
-            response = await self.client.post(
+            status, resp_headers, data, text = await self._post_message(
                 url,
-                json=initialize_message,
-                headers={
+                _json_dumps(initialize_message),
+                {
                     "Content-Type": "application/json",
                     "Accept": self._get_accept_header()
                 }
             )
 
-            if response.status_code == 200:
+            if status == 200:
                 # httpx Headers are case-insensitive, but use lowercase for consistency
-                self.session_header = response.headers.get("mcp-session-id")
-                data = self._parse_response(response.text)
+                self.session_header = resp_headers.get("mcp-session-id")
                 if data and "result" in data:
                     return {
                         "success": True,
@@ -121,7 +190,7 @@ class MCPClientBase(ABC):
 
             return {
                 "success": False,
-                "error": f"HTTP {response.status_code}: {response.text[:500]}"
+                "error": f"HTTP {status}: {text[:500]}"
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -130,12 +199,8 @@ class MCPClientBase(ABC):
         """List available tools via MCP."""
         url = self._get_mcp_url()
 
-        list_message = {
-            "jsonrpc": "2.0",
-            "id": self._next_message_id(),
-            "method": "tools/list",
-            "params": {}
-        }
+        list_message = self._list_template
+        list_message["id"] = self._next_message_id()
 
         headers = {
             "Content-Type": "application/json",
@@ -145,10 +210,11 @@ class MCPClientBase(ABC):
             headers["mcp-session-id"] = self.session_header
 
         try:
-            response = await self.client.post(url, json=list_message, headers=headers)
+            status, _, data, text = await self._post_message(
+                url, _json_dumps(list_message), headers
+            )
 
-            if response.status_code == 200:
-                data = self._parse_response(response.text)
+            if status == 200:
                 if data and "result" in data:
                     return {"success": True, "tools": data["result"].get("tools", [])}
                 elif data and "error" in data:
@@ -157,18 +223,18 @@ class MCPClientBase(ABC):
                     return {"success": False, "error": error_str, "blocked": True}
 
             # Check if blocked by security guard
-            if response.status_code in [403, 400]:
+            if status in [403, 400]:
                 return {
                     "success": False,
-                    "error": response.text[:500],
+                    "error": text[:500],
                     "blocked": True,
-                    "status_code": response.status_code
+                    "status_code": status
                 }
 
             return {
                 "success": False,
-                "error": f"HTTP {response.status_code}: {response.text[:500]}",
-                "raw_response": response.text
+                "error": f"HTTP {status}: {text[:500]}",
+                "raw_response": text
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -177,15 +243,10 @@ class MCPClientBase(ABC):
         """Call an MCP tool."""
         url = self._get_mcp_url()
 
-        tool_call_message = {
-            "jsonrpc": "2.0",
-            "id": self._next_message_id(),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
+        tool_call_message = self._call_template
+        tool_call_message["id"] = self._next_message_id()
+        tool_call_message["params"]["name"] = tool_name
+        tool_call_message["params"]["arguments"] = arguments
 
         headers = {
             "Content-Type": "application/json",
@@ -195,10 +256,11 @@ class MCPClientBase(ABC):
             headers["mcp-session-id"] = self.session_header
 
         try:
-            response = await self.client.post(url, json=tool_call_message, headers=headers)
+            status, _, data, text = await self._post_message(
+                url, _json_dumps(tool_call_message), headers
+            )
 
-            if response.status_code == 200:
-                data = self._parse_response(response.text)
+            if status == 200:
                 if data and "result" in data:
                     return {"success": True, "result": data["result"]}
                 elif data and "error" in data:
@@ -206,38 +268,143 @@ class MCPClientBase(ABC):
                     error_str = json.dumps(error) if isinstance(error, dict) else str(error)
                     return {"success": False, "error": error_str}
 
-            if response.status_code in [403, 400]:
+            if status in [403, 400]:
                 return {
                     "success": False,
-                    "error": response.text[:500],
+                    "error": text[:500],
                     "blocked": True,
-                    "status_code": response.status_code
+                    "status_code": status
                 }
 
             return {
                 "success": False,
-                "error": f"HTTP {response.status_code}: {response.text[:500]}"
+                "error": f"HTTP {status}: {text[:500]}"
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
 
+    async def call_tool_batch(
+        self, calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Call several MCP tools in one JSON-RPC 2.0 batch POST.
+
+        Results come back in the same order as `calls`, matched to
+        requests by JSON-RPC id. One HTTP round-trip carries the whole
+        batch, amortizing framing and parse cost across the calls.
+        """
+        url = self._get_mcp_url()
+
+        batch = []
+        ids = []
+        for tool_name, arguments in calls:
+            msg_id = self._next_message_id()
+            ids.append(msg_id)
+            batch.append({
+                "jsonrpc": "2.0",
+                "id": msg_id,
+                "method": "tools/call",
+                "params": {"name": tool_name, "arguments": arguments}
+            })
+
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": self._get_accept_header()
+        }
+        if self.session_header:
+            headers["mcp-session-id"] = self.session_header
+
+        try:
+            response = await self.client.post(
+                url, content=_json_dumps(batch), headers=headers
+            )
+        except Exception as e:
+            return [{"success": False, "error": str(e)} for _ in calls]
+
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}: {response.text[:500]}"
+            blocked = response.status_code in [403, 400]
+            return [
+                {"success": False, "error": error, "blocked": blocked}
+                for _ in calls
+            ]
+
+        by_id = {m.get("id"): m for m in self._parse_batch_response(response.text)}
+        results = []
+        for msg_id in ids:
+            data = by_id.get(msg_id)
+            if data is None:
+                results.append({"success": False, "error": f"no response for id {msg_id}"})
+            elif "result" in data:
+                results.append({"success": True, "result": data["result"]})
+            else:
+                error = data.get("error", "Unknown error")
+                error_str = json.dumps(error) if isinstance(error, dict) else str(error)
+                results.append({"success": False, "error": error_str})
+        return results
+
+    def _parse_batch_response(self, response_text: str) -> List[Dict[str, Any]]:
+        """Extract all JSON-RPC messages from a batch response body.
+
+        Servers may answer with one JSON array, a single object, or a
+        sequence of SSE `data:` frames (each a message or an array).
+        """
+        try:
+            data = _json_loads(response_text)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            return [data]
+
+        messages: List[Dict[str, Any]] = []
+        for line in response_text.split('\n'):
+            if line.startswith('data: '):
+                try:
+                    frame = _json_loads(line[6:])
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(frame, list):
+                    messages.extend(frame)
+                else:
+                    messages.append(frame)
+        return messages
+
+
 class MCPSSEClient(MCPClientBase):
     """MCP client that uses Server-Sent Events (SSE) transport protocol."""
 
     def _get_accept_header(self) -> str:
         return "application/json, text/event-stream"
 
+    async def _post_message(
+        self, url: str, body: bytes, headers: Dict[str, str]
+    ) -> Tuple[int, Any, Optional[Dict[str, Any]], str]:
+        """Stream the SSE response and stop at the first JSON-RPC frame.
+
+        Large tool results arrive as one `data:` line inside a stream we
+        would otherwise buffer, decode and split wholesale; iterating
+        lines returns as soon as the frame is decoded and never holds
+        the full body. Error bodies are still read in full for
+        reporting.
+        """
+        async with self.client.stream("POST", url, content=body, headers=headers) as response:
+            if response.status_code == 200:
+                async for line in response.aiter_lines():
+                    if line.startswith('data: '):
+                        try:
+                            data = _json_loads(line[6:])
+                        except json.JSONDecodeError:
+                            continue
+                        return response.status_code, response.headers, data, ""
+                return response.status_code, response.headers, None, ""
+            text = (await response.aread()).decode("utf-8", errors="replace")
+            return response.status_code, response.headers, None, text
+
     def _parse_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """Parse SSE response and extract JSON-RPC message."""
-        for line in response_text.split('\n'):
-            if line.startswith('data: '):
-                data_str = line[6:]
-                try:
-                    return json.loads(data_str)
-                except json.JSONDecodeError:
-                    continue
-        return None
+        return _find_sse_frame(response_text)
 
     async def test_connection(self) -> Dict[str, Any]:
         """Test basic connectivity to MCP endpoint via SSE."""
@@ -280,16 +447,10 @@ class MCPStreamableHTTPClient(MCPClientBase):
             return None
 
         try:
-            return json.loads(response_text)
+            return _json_loads(response_text)
         except json.JSONDecodeError:
             # Try SSE format as fallback (some servers may return SSE even for JSON accept)
-            for line in response_text.split('\n'):
-                if line.startswith('data: '):
-                    try:
-                        return json.loads(line[6:])
-                    except json.JSONDecodeError:
-                        continue
-            return None
+            return _find_sse_frame(response_text)
 
     async def test_connection(self) -> Dict[str, Any]:
         """Test basic connectivity to MCP endpoint via Streamable HTTP."""
@@ -353,16 +514,15 @@ class MCPStreamableHTTPClient(MCPClientBase):
         }
 
         try:
-            response = await self.client.post(
+            status, resp_headers, data, text = await self._post_message(
                 url,
-                json=initialize_message,
-                headers=headers
+                _json_dumps(initialize_message),
+                headers
             )
 
-            if response.status_code == 200:
+            if status == 200:
                 # httpx Headers are case-insensitive
-                self.session_header = response.headers.get("mcp-session-id")
-                data = self._parse_response(response.text)
+                self.session_header = resp_headers.get("mcp-session-id")
                 if data and "result" in data:
                     return {
                         "success": True,
@@ -376,27 +536,29 @@ class MCPStreamableHTTPClient(MCPClientBase):
 
             return {
                 "success": False,
-                "error": f"HTTP {response.status_code}: {response.text[:500]}"
+                "error": f"HTTP {status}: {text[:500]}"
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
 
-def create_mcp_client(base_url: str, route: str, transport: str = "streamable") -> MCPClientBase:
+def create_mcp_client(base_url: str, route: str, transport: str = "streamable",
+                      http_client: Optional[httpx.AsyncClient] = None) -> MCPClientBase:
     """Factory function to create MCP client with specified transport.
 
     Args:
         base_url: Gateway base URL (e.g., http://localhost:8080)
         route: Route path (e.g., "pii-test", "poison", "rug-pull")
         transport: Transport type - "streamable" (default) or "sse"
+        http_client: Optional shared httpx.AsyncClient (see MCPClientBase)
 
     Returns:
         MCPClientBase: Appropriate client instance
     """
     if transport.lower() in ["streamable", "streamable-http", "http"]:
-        return MCPStreamableHTTPClient(base_url, route)
+        return MCPStreamableHTTPClient(base_url, route, http_client)
     else:
-        return MCPSSEClient(base_url, route)
+        return MCPSSEClient(base_url, route, http_client)
 
 
 class TestResults: